@@ -1,9 +1,6 @@
-import matplotlib
-matplotlib.use('Agg')  # 设置Agg后端，应该在导入pyplot之前设置
-import matplotlib.pyplot as plt
 import numpy as np
 import os
-import datetime
+from PlotKit import save_and_render  # 使用Agg后端，并保存原始数据以便重新绘图
 
 # 创建保存图像的目录
 save_dir = r'C:\Users\X1\Desktop\result'
@@ -60,23 +57,23 @@ def update_speed(nodes, task, selected_indices):
         else:
             node['speed'] = min(15, node['speed'] + 0.1)  # 未被选中的节点速度逐渐恢复
 
-def select_nodes(nodes, dynamic):
+def select_nodes(nodes, dynamic, num_candidates=30, committee_size=7):
     if dynamic:
         selections = sorted(( node['load']/ node['speed'], idx) for idx, node in enumerate(nodes))
-        selected_indices_15 = [idx for _, idx in selections[:30]]
+        selected_indices_15 = [idx for _, idx in selections[:num_candidates]]
         accuracy_scores = [(nodes[idx]['accuracy'], idx) for idx in selected_indices_15]
         accuracy_scores.sort(reverse=True)
-        selected_indices = [idx for _, idx in accuracy_scores[:7]]
+        selected_indices = [idx for _, idx in accuracy_scores[:committee_size]]
     else:
-        selected_indices = np.random.choice(len(nodes), 7, replace=False).tolist()
+        selected_indices = np.random.choice(len(nodes), committee_size, replace=False).tolist()
     return selected_indices
 
 def update_accuracy(nodes, selection_indices, votes, task):
     # Correctly count true votes from the list of boolean votes
     majority_vote = sum(votes) > len(votes) / 2
-    for idx in selection_indices:
+    # Reuse the votes counted for the decision: calling 'vote' again would re-roll random nodes
+    for idx, node_vote in zip(selection_indices, votes):
         node = nodes[idx]
-        node_vote = node['vote'](task, len(node.get('history', [])))  # task is now available
         if (node_vote == majority_vote):
             node['positive_streak'] += 1
             node['negative_streak'] = 0
@@ -89,8 +86,8 @@ def update_accuracy(nodes, selection_indices, votes, task):
             node['accuracy'] = max(node['accuracy'] - decrease, 0)
 
 
-def execute_cumulative_tasks(nodes, task, dynamic=True):
-    selection_indices = select_nodes(nodes, dynamic)
+def execute_cumulative_tasks(nodes, task, dynamic=True, num_candidates=30, committee_size=7):
+    selection_indices = select_nodes(nodes, dynamic, num_candidates, committee_size)
     votes = [nodes[idx]['vote'](task, len(nodes[idx].get('history', []))) for idx in selection_indices]
     for idx in selection_indices:
         nodes[idx]['time'] +=  task['duration']/ nodes[idx]['speed']
@@ -147,33 +144,27 @@ average_accuracy_improvement_percentage = np.mean([(d - r) / r * 100 if r != 0 e
 print("Average Time Savings: {:.1f}%".format(average_time_savings_percentage))
 print("Average Accuracy Improvement: {:.1f}%".format(average_accuracy_improvement_percentage))
 
-def save_plot_with_timestamp(directory, base_filename, figure):
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{base_filename}_{timestamp}.png"
-    figure.savefig(os.path.join(directory, filename))
-    plt.close(figure)
-
 # 任务完成时间图
-plt.figure(figsize=(10, 6))
-plt.plot(list(x_ticks), times_dynamic, label='Dynamic Strategy', marker='o')
-plt.plot(list(x_ticks), times_random, label='Random Strategy', marker='x')
-plt.xlabel('Task Count')
-plt.ylabel('Task Completion Time (Time Units)')
-plt.title('Comparison of Task Completion Time ')
-plt.legend()
-plt.grid(True)
-save_plot_with_timestamp(save_dir, 'Total_Time_Comparison', plt.gcf())
+save_and_render({
+    'series': [
+        {'label': 'Dynamic Strategy', 'x': np.array(x_ticks), 'y': np.array(times_dynamic), 'style': {'marker': 'o'}},
+        {'label': 'Random Strategy', 'x': np.array(x_ticks), 'y': np.array(times_random), 'style': {'marker': 'x'}},
+    ],
+    'xlabel': 'Task Count',
+    'ylabel': 'Task Completion Time (Time Units)',
+    'title': 'Comparison of Task Completion Time ',
+    'figsize': [10, 6],
+}, save_dir, 'Total_Time_Comparison')
 
 # 决策准确性图
-plt.figure(figsize=(10, 6))
-plt.plot(list(x_ticks), accuracies_dynamic, label='Dynamic Strategy', marker='o')
-plt.plot(list(x_ticks), accuracies_random, label='Random Strategy', marker='x')
-plt.xlabel('Task Count')
-plt.ylabel('Decision Accuracy (%)')
-plt.ylim(0, 110)  # 设置Y轴范围为0到110
-plt.title('Comparison of Decision Accuracy ')
-plt.legend()
-plt.grid(True)
-save_plot_with_timestamp(save_dir, 'Accuracy_Comparison', plt.gcf())
+save_and_render({
+    'series': [
+        {'label': 'Dynamic Strategy', 'x': np.array(x_ticks), 'y': np.array(accuracies_dynamic), 'style': {'marker': 'o'}},
+        {'label': 'Random Strategy', 'x': np.array(x_ticks), 'y': np.array(accuracies_random), 'style': {'marker': 'x'}},
+    ],
+    'xlabel': 'Task Count',
+    'ylabel': 'Decision Accuracy (%)',
+    'ylim': [0, 110],  # 设置Y轴范围为0到110
+    'title': 'Comparison of Decision Accuracy ',
+    'figsize': [10, 6],
+}, save_dir, 'Accuracy_Comparison')
@@ -0,0 +1,154 @@
+import time
+import warnings
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.schemes.abenc.abenc_waters09 import CPabe09
+from charm.core.engine.util import objectToBytes
+
+# CP-ABE schemes that can serve a sensitivity level
+ABE_SCHEMES = {
+    'BSW07': CPabe_BSW07,
+    'Waters09': CPabe09,
+}
+
+# Nominal security of each pairing curve, used to decide which backends a level may use
+CURVE_SECURITY_BITS = {
+    'SS512': 80,
+    'SS1024': 112,
+    'MNT159': 70,
+    'MNT201': 90,
+    'MNT224': 100,
+    'BN254': 128,
+}
+
+DEFAULT_BACKEND = ('SS512', 'BSW07')
+
+# (curve, scheme) serving each sensitivity level, e.g. ('SS1024', 'BSW07') for 'high'
+LEVEL_BACKENDS = {
+    'low': DEFAULT_BACKEND,
+    'medium': DEFAULT_BACKEND,
+    'high': DEFAULT_BACKEND,
+}
+
+# Minimum curve security each sensitivity level requires, checked against LEVEL_BACKENDS. The defaults match
+# the shipped SS512 backends; raising 'high' to TARGET_SECURITY_BITS['high'] is opt-in together with moving
+# it to a curve that meets it, e.g. ('SS1024', 'BSW07').
+LEVEL_SECURITY_BITS = {
+    'low': 80,
+    'medium': 80,
+    'high': 80,
+}
+
+# Security each level should reach, used by the benchmark when recommending backends
+TARGET_SECURITY_BITS = {
+    'low': 80,
+    'medium': 80,
+    'high': 112,
+}
+
+backends = {}
+# Levels already warned about running below their LEVEL_SECURITY_BITS
+underpowered_levels = set()
+
+def setup_backend(curve, scheme):
+    """Create the pairing group and ABE scheme for (curve, scheme) and run its setup."""
+    group = PairingGroup(curve)
+    cpabe = ABE_SCHEMES[scheme](group)
+    if scheme == 'Waters09':
+        mk, pk = cpabe.setup()  # CPabe09.setup() returns (msk, pk)
+    else:
+        pk, mk = cpabe.setup()
+    return {'name': (curve, scheme), 'group': group, 'cpabe': cpabe, 'pk': pk, 'mk': mk}
+
+def get_backend(curve, scheme):
+    """Return the shared backend for (curve, scheme), running setup on first use."""
+    if (curve, scheme) not in backends:
+        backends[(curve, scheme)] = setup_backend(curve, scheme)
+    return backends[(curve, scheme)]
+
+def backend_for_level(level):
+    """Return the backend configured for a sensitivity level, warning once if its curve is below the level's requirement."""
+    curve, scheme = LEVEL_BACKENDS.get(level, DEFAULT_BACKEND)
+    required = LEVEL_SECURITY_BITS.get(level, 0)
+    if CURVE_SECURITY_BITS.get(curve, 0) < required and level not in underpowered_levels:
+        underpowered_levels.add(level)
+        warnings.warn(f"{level!r} level is served by {curve} ({CURVE_SECURITY_BITS.get(curve)} bits) "
+                      f"but requires {required} bits; see recommend_level_backends", RuntimeWarning)
+    return get_backend(curve, scheme)
+
+def ciphertext_size(backend, ciphertext):
+    """Size in bytes of a serialized ABE ciphertext."""
+    return len(objectToBytes(ciphertext, backend['group']))
+
+def benchmark_backend(curve, scheme, attributes, policy, runs):
+    """Measure keygen/encrypt/decrypt latency (ms) and ciphertext size for one backend."""
+    start_time = time.perf_counter()
+    backend = setup_backend(curve, scheme)
+    setup_time = time.perf_counter() - start_time
+    group, cpabe, pk, mk = backend['group'], backend['cpabe'], backend['pk'], backend['mk']
+
+    keygen_time = encrypt_time = decrypt_time = 0
+    size = 0
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        sk = cpabe.keygen(pk, mk, attributes)
+        keygen_time += time.perf_counter() - start_time
+
+        message = group.random(GT)
+        start_time = time.perf_counter()
+        ct = cpabe.encrypt(pk, message, policy)
+        encrypt_time += time.perf_counter() - start_time
+        size = ciphertext_size(backend, ct)
+
+        start_time = time.perf_counter()
+        recovered = cpabe.decrypt(pk, sk, ct)
+        decrypt_time += time.perf_counter() - start_time
+        if recovered != message:
+            raise ValueError(f"{curve}/{scheme} failed to decrypt its own ciphertext")
+
+    return {
+        'curve': curve,
+        'scheme': scheme,
+        'security_bits': CURVE_SECURITY_BITS.get(curve, 0),
+        'setup_ms': setup_time * 1000,
+        'keygen_ms': keygen_time / runs * 1000,
+        'encrypt_ms': encrypt_time / runs * 1000,
+        'decrypt_ms': decrypt_time / runs * 1000,
+        'ciphertext_bytes': size,
+    }
+
+def benchmark_backends(curves=tuple(CURVE_SECURITY_BITS), schemes=tuple(ABE_SCHEMES),
+                       attributes=['ONE', 'TWO', 'THREE'], policy='((ONE or THREE) and (TWO or FOUR))', runs=10):
+    """Run the benchmark for every (curve, scheme) pair; pairs that fail are reported with their error."""
+    results = []
+    for curve in curves:
+        for scheme in schemes:
+            try:
+                results.append(benchmark_backend(curve, scheme, attributes, policy, runs))
+            except Exception as e:
+                results.append({'curve': curve, 'scheme': scheme, 'error': str(e)})
+    return results
+
+def recommend_level_backends(results, level_security_bits=TARGET_SECURITY_BITS):
+    """Pick, per level, the backend with the lowest encrypt+decrypt latency that meets its security bits."""
+    recommendation = {}
+    for level, required_bits in level_security_bits.items():
+        candidates = [r for r in results if 'error' not in r and r['security_bits'] >= required_bits]
+        if candidates:
+            best = min(candidates, key=lambda r: r['encrypt_ms'] + r['decrypt_ms'])
+            recommendation[level] = (best['curve'], best['scheme'])
+    return recommendation
+
+def print_results(results):
+    print(f"{'curve':<8} {'scheme':<9} {'bits':>4} {'keygen ms':>10} {'encrypt ms':>11} {'decrypt ms':>11} {'ct bytes':>9}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['curve']:<8} {r['scheme']:<9} error: {r['error']}")
+            continue
+        print(f"{r['curve']:<8} {r['scheme']:<9} {r['security_bits']:>4} {r['keygen_ms']:>10.2f} "
+              f"{r['encrypt_ms']:>11.2f} {r['decrypt_ms']:>11.2f} {r['ciphertext_bytes']:>9}")
+
+if __name__ == "__main__":
+    results = benchmark_backends()
+    print_results(results)
+    print("Fastest backend per level:", recommend_level_backends(results))
@@ -0,0 +1,269 @@
+import hashlib
+from collections import defaultdict
+
+# In-process stand-in for ERTBRM.sol and ABETokenAccessControl.sol. Contract state lives in plain
+# dicts that mirror the Solidity mappings; every state-changing call is metered with an approximate
+# gas model (intrinsic cost, calldata, storage reads/writes, event logs) and a latency model, so the
+# Python simulations can account for ledger cost without a live chain.
+
+TX_BASE_GAS = 21000
+CALLDATA_ZERO_BYTE_GAS = 4
+CALLDATA_NONZERO_BYTE_GAS = 16
+SLOAD_COLD_GAS = 2100
+SLOAD_WARM_GAS = 100
+SSTORE_SET_GAS = 20000       # zero -> non-zero
+SSTORE_RESET_GAS = 2900      # non-zero -> different value
+LOG_GAS = 375
+LOG_TOPIC_GAS = 375
+LOG_DATA_BYTE_GAS = 8
+
+REPUTATION_SCALE = 100  # reputation is a uint256 on chain, so RP values are stored in hundredths
+
+class ContractRevert(Exception):
+    pass
+
+def address_for(name):
+    """Deterministic 20-byte address for a user or node name."""
+    return '0x' + hashlib.sha256(str(name).encode()).hexdigest()[:40]
+
+def abi_size(value):
+    """Bytes a value takes in ABI encoding (head + tail for strings)."""
+    if isinstance(value, str) and not value.startswith('0x'):
+        return 64 + -(-len(value.encode()) // 32) * 32
+    return 32
+
+def abi_bytes(value):
+    if isinstance(value, bool):
+        return int(value).to_bytes(32, 'big')
+    if isinstance(value, int):
+        return value.to_bytes(32, 'big')
+    if value.startswith('0x'):
+        return bytes.fromhex(value[2:]).rjust(32, b'\0')
+    data = value.encode()
+    return (32).to_bytes(32, 'big') + len(data).to_bytes(32, 'big') + data.ljust(-(-len(data) // 32) * 32, b'\0')
+
+def calldata_gas(args):
+    data = b'\xff' * 4 + b''.join(abi_bytes(arg) for arg in args)  # selector counted as non-zero
+    zeros = data.count(0)
+    return zeros * CALLDATA_ZERO_BYTE_GAS + (len(data) - zeros) * CALLDATA_NONZERO_BYTE_GAS
+
+def storage_slots(value):
+    if isinstance(value, str) and len(value.encode()) > 31:
+        return 1 + -(-len(value.encode()) // 32)
+    return 1
+
+class Chain:
+    def __init__(self, block_time=12.0, rpc_latency=0.05, confirmations=1, gas_price_gwei=20, auto_mine=True):
+        self.block_time = block_time
+        self.rpc_latency = rpc_latency
+        self.confirmations = confirmations
+        self.gas_price_gwei = gas_price_gwei
+        self.auto_mine = auto_mine
+        self.block_number = 1
+        self.events = []
+        self.calls = []
+
+    def mine(self):
+        self.block_number += 1
+
+    def transaction_latency(self):
+        return self.rpc_latency + self.block_time * self.confirmations
+
+    def report(self):
+        """Per (contract, function): calls, reverts, total/mean gas, cost in ETH and total latency."""
+        summary = defaultdict(lambda: {'calls': 0, 'reverts': 0, 'gas': 0, 'latency': 0.0})
+        for call in self.calls:
+            entry = summary[(call['contract'], call['function'])]
+            entry['calls'] += 1
+            entry['reverts'] += call['reverted']
+            entry['gas'] += call['gas']
+            entry['latency'] += call['latency']
+        for entry in summary.values():
+            entry['mean_gas'] = entry['gas'] / entry['calls']
+            entry['cost_eth'] = entry['gas'] * self.gas_price_gwei * 1e-9
+        return dict(summary)
+
+    def print_report(self):
+        print(f"{'contract.function':<40} {'calls':>7} {'reverts':>7} {'gas':>12} {'mean gas':>10} {'ETH':>10} {'latency s':>10}")
+        for (contract, function), entry in sorted(self.report().items()):
+            print(f"{contract + '.' + function:<40} {entry['calls']:>7} {entry['reverts']:>7} {entry['gas']:>12} "
+                  f"{entry['mean_gas']:>10.0f} {entry['cost_eth']:>10.6f} {entry['latency']:>10.2f}")
+
+class Contract:
+    def __init__(self, chain):
+        self.chain = chain
+        self.name = type(self).__name__.replace('Sim', '')
+        self.meter = None
+
+    def begin(self, function, *args):
+        self.meter = {'function': function, 'gas': TX_BASE_GAS + calldata_gas(args), 'warm': set()}
+
+    def end(self, reverted=False):
+        self.chain.calls.append({
+            'contract': self.name,
+            'function': self.meter['function'],
+            'gas': self.meter['gas'],
+            'reverted': reverted,
+            'block': self.chain.block_number,
+            'latency': self.chain.transaction_latency(),
+        })
+        self.meter = None
+        if self.chain.auto_mine:
+            self.chain.mine()
+
+    def view(self, function):
+        self.chain.calls.append({'contract': self.name, 'function': function, 'gas': 0, 'reverted': False,
+                                 'block': self.chain.block_number, 'latency': self.chain.rpc_latency})
+
+    def require(self, condition, message):
+        if not condition:
+            if self.meter is not None:
+                self.end(reverted=True)
+            raise ContractRevert(message)
+
+    def sload(self, key):
+        if self.meter is not None:
+            self.meter['gas'] += SLOAD_WARM_GAS if key in self.meter['warm'] else SLOAD_COLD_GAS
+            self.meter['warm'].add(key)
+
+    def sstore(self, key, old, new):
+        self.sload(key)
+        if old == new:
+            return
+        slots = storage_slots(new)
+        self.meter['gas'] += slots * (SSTORE_SET_GAS if not old else SSTORE_RESET_GAS)
+
+    def emit(self, event, args, indexed=()):
+        data_bytes = sum(abi_size(value) for name, value in args.items() if name not in indexed)
+        self.meter['gas'] += LOG_GAS + LOG_TOPIC_GAS * (1 + len(indexed)) + LOG_DATA_BYTE_GAS * data_bytes
+        self.chain.events.append({
+            'contract': self.name,
+            'event': event,
+            'args': dict(args),
+            'block': self.chain.block_number,
+            'log_index': len(self.chain.events),
+        })
+
+class ERTBRMSim(Contract):
+    def __init__(self, chain):
+        super().__init__(chain)
+        self.dataRegistry = {}
+        self.reputation = {}
+        self.arbitrations = {}
+        self.accessControl = {}
+        self.arbitrationCount = 0
+
+    def uploadData(self, sender, id, metadata):
+        self.begin('uploadData', id, metadata)
+        self.require(len(metadata) > 0, "Metadata cannot be empty")
+        old = self.dataRegistry.get(id, {'id': 0, 'metadata': '', 'uploader': None})
+        self.sstore(('dataRegistry', id, 'id'), old['id'], id)
+        self.sstore(('dataRegistry', id, 'metadata'), old['metadata'], metadata)
+        self.sstore(('dataRegistry', id, 'uploader'), old['uploader'], sender)
+        self.dataRegistry[id] = {'id': id, 'metadata': metadata, 'uploader': sender}
+        self.emit('DataUploaded', {'id': id, 'metadata': metadata, 'uploader': sender})
+        self.end()
+
+    def requestData(self, sender, id):
+        self.view('requestData')
+        self.require(self.accessControl.get(sender, False), "Access denied")
+        data = self.dataRegistry.get(id, {'id': 0, 'metadata': ''})
+        self.require(data['id'] == id, "Data not found")
+        return data['metadata']
+
+    def grantAccess(self, sender, user):
+        self.begin('grantAccess', user)
+        self.sstore(('accessControl', user), self.accessControl.get(user, False), True)
+        self.accessControl[user] = True
+        self.emit('AccessGranted', {'user': user})
+        self.end()
+
+    def revokeAccess(self, sender, user):
+        self.begin('revokeAccess', user)
+        self.sstore(('accessControl', user), self.accessControl.get(user, False), False)
+        self.accessControl[user] = False
+        self.emit('AccessRevoked', {'user': user})
+        self.end()
+
+    def updateReputation(self, sender, user, newScore):
+        self.begin('updateReputation', user, newScore)
+        self.require(user != '0x' + '0' * 40, "Invalid address")
+        self.sstore(('reputation', user), self.reputation.get(user, 0), newScore)
+        self.reputation[user] = newScore
+        self.emit('ReputationUpdated', {'user': user, 'newScore': newScore})
+        self.end()
+
+    def initiateArbitration(self, sender, disputeDescription):
+        self.begin('initiateArbitration', disputeDescription)
+        self.sstore(('arbitrationCount',), self.arbitrationCount, self.arbitrationCount + 1)
+        self.arbitrationCount += 1
+        dispute_id = self.arbitrationCount
+        self.sstore(('arbitrations', dispute_id, 'disputeId'), 0, dispute_id)
+        self.sstore(('arbitrations', dispute_id, 'initiator'), None, sender)
+        self.sstore(('arbitrations', dispute_id, 'resolution'), '', disputeDescription)
+        self.arbitrations[dispute_id] = {'disputeId': dispute_id, 'initiator': sender,
+                                         'resolution': disputeDescription, 'resolved': False}
+        self.emit('ArbitrationInitiated', {'disputeId': dispute_id, 'initiator': sender})
+        self.end()
+
+    def resolveArbitration(self, sender, disputeId, resolution):
+        self.begin('resolveArbitration', disputeId, resolution)
+        arbitration = self.arbitrations.get(disputeId, {'disputeId': 0, 'initiator': None, 'resolution': '', 'resolved': False})
+        self.sload(('arbitrations', disputeId, 'resolved'))
+        self.require(not arbitration['resolved'], "Arbitration already resolved")
+        self.sstore(('arbitrations', disputeId, 'resolution'), arbitration['resolution'], resolution)
+        self.sstore(('arbitrations', disputeId, 'resolved'), False, True)
+        self.arbitrations[disputeId] = dict(arbitration, resolution=resolution, resolved=True)
+        self.emit('ArbitrationResolved', {'disputeId': disputeId, 'resolution': resolution})
+        self.end()
+
+class ABETokenAccessControlSim(Contract):
+    def __init__(self, chain):
+        super().__init__(chain)
+        self.users = {}
+        self.dataItems = {}
+        self.tokenGranted = {}
+
+    def registerUser(self, sender, userAddress, reputationLevel):
+        self.begin('registerUser', userAddress, reputationLevel)
+        self.sload(('users', userAddress))
+        self.require(not self.users.get(userAddress, {}).get('isRegistered', False), "User already registered.")
+        self.sstore(('users', userAddress, 'reputationLevel'), 0, reputationLevel)
+        self.sstore(('users', userAddress, 'isRegistered'), False, True)
+        self.users[userAddress] = {'reputationLevel': reputationLevel, 'isRegistered': True}
+        self.end()
+
+    def addData(self, sender, dataId, sensitivityLevel, dataContent):
+        self.begin('addData', dataId, sensitivityLevel, dataContent)
+        old = self.dataItems.get(dataId, {'sensitivityLevel': 0, 'dataContent': ''})
+        self.sstore(('dataItems', dataId, 'sensitivityLevel'), old['sensitivityLevel'], sensitivityLevel)
+        self.sstore(('dataItems', dataId, 'dataContent'), old['dataContent'], dataContent)
+        self.dataItems[dataId] = {'sensitivityLevel': sensitivityLevel, 'dataContent': dataContent}
+        self.end()
+
+    def grantToken(self, sender, userAddress):
+        self.begin('grantToken', userAddress)
+        self.sload(('users', userAddress))
+        self.require(self.users.get(userAddress, {}).get('isRegistered', False), "User not registered.")
+        self.sstore(('tokenGranted', userAddress), self.tokenGranted.get(userAddress, False), True)
+        self.tokenGranted[userAddress] = True
+        self.end()
+
+    def requestDataAccess(self, sender, dataId):
+        self.begin('requestDataAccess', dataId)
+        self.sload(('users', sender))
+        self.require(self.users.get(sender, {}).get('isRegistered', False), "User not registered.")
+        self.sload(('tokenGranted', sender))
+        self.require(self.tokenGranted.get(sender, False), "Token not granted.")
+        user = self.users[sender]
+        self.sload(('dataItems', dataId))
+        data = self.dataItems.get(dataId, {'sensitivityLevel': 0, 'dataContent': ''})
+
+        access_granted = ((user['reputationLevel'] >= 3 and data['sensitivityLevel'] <= 3) or
+                          (user['reputationLevel'] == 2 and data['sensitivityLevel'] <= 2) or
+                          (user['reputationLevel'] == 1 and data['sensitivityLevel'] == 1))
+
+        self.emit('AccessControlResult', {'user': sender, 'dataId': dataId, 'accessGranted': access_granted},
+                  indexed=('user', 'dataId'))
+        self.end()
+        return access_granted
@@ -0,0 +1,44 @@
+import math
+import time
+import numpy as np
+
+from NodePool import initialize_pool, execute_task, NUM_CANDIDATES, COMMITTEE_SIZE
+
+# Committee-size sweep for the array voting engine: each committee's votes are drawn once per task as
+# one vector, and majority and streak updates run on arrays, so committees of thousands stay cheap.
+# The candidate pool keeps the 30:7 ratio of select_nodes and the population is ten times the pool.
+
+def candidates_for(committee_size):
+    return math.ceil(committee_size * NUM_CANDIDATES / COMMITTEE_SIZE)
+
+def benchmark_committee(committee_size, num_tasks=2000, num_nodes=None, seed=0):
+    """Per-task latency (ms) and decision accuracy (%) for one committee size."""
+    num_candidates = candidates_for(committee_size)
+    num_nodes = num_nodes or max(100, 10 * num_candidates)
+    rng = np.random.default_rng(seed)
+    pool = initialize_pool(num_nodes, rng=rng)
+    durations = rng.choice([5, 10, 15], num_tasks)
+
+    correct = 0
+    total_time = 0.0
+    start_time = time.perf_counter()
+    for duration in durations:
+        decision, task_time = execute_task(pool, duration, rng, num_candidates=num_candidates, committee_size=committee_size)
+        correct += bool(decision)
+        total_time += float(task_time)
+    elapsed = time.perf_counter() - start_time
+    return {
+        'committee_size': committee_size,
+        'num_candidates': num_candidates,
+        'num_nodes': num_nodes,
+        'latency_ms': elapsed / num_tasks * 1000,
+        'accuracy': correct / num_tasks * 100,
+        'task_time': total_time,
+    }
+
+if __name__ == "__main__":
+    print(f"{'committee':>9} {'candidates':>10} {'nodes':>7} {'ms/task':>8} {'accuracy %':>10} {'task time':>12}")
+    for committee_size in (7, 15, 31, 63, 127, 255, 511, 1023, 2047, 4095):
+        r = benchmark_committee(committee_size)
+        print(f"{r['committee_size']:>9} {r['num_candidates']:>10} {r['num_nodes']:>7} {r['latency_ms']:>8.3f} "
+              f"{r['accuracy']:>10.1f} {r['task_time']:>12.1f}")
@@ -0,0 +1,208 @@
+import json
+import time
+from array import array
+import numpy as np
+
+# Column-wise store for the contract events (DataUploaded, AccessGranted, AccessRevoked, ReputationUpdated,
+# ArbitrationInitiated, ArbitrationResolved, AccessControlResult). Records come from a JSONL file or from
+# ChainSim's event list; addresses and data ids are dictionary-encoded, rows are kept in block order and
+# indexed by address and data id so that filtered queries only touch matching rows.
+
+# event -> (address argument, data id argument, value argument)
+EVENT_FIELDS = {
+    'DataUploaded': ('uploader', 'id', None),
+    'AccessGranted': ('user', None, None),
+    'AccessRevoked': ('user', None, None),
+    'ReputationUpdated': ('user', None, 'newScore'),
+    'ArbitrationInitiated': ('initiator', None, 'disputeId'),
+    'ArbitrationResolved': (None, None, 'disputeId'),
+    'AccessControlResult': ('user', 'dataId', 'accessGranted'),
+}
+
+class Dictionary:
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+class EventStore:
+    def __init__(self):
+        self.events = Dictionary()
+        self.addresses = Dictionary()
+        self.data_ids = Dictionary()
+        self.texts = {}  # row -> string arguments (metadata, resolution), which are not columnar
+        self.staging = {name: array('q') for name in ('block', 'log_index', 'event', 'address', 'data_id', 'value')}
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in
+                        (('block', np.int64), ('log_index', np.int64), ('event', np.int16),
+                         ('address', np.int32), ('data_id', np.int32), ('value', np.int64))}
+        self.address_index = None
+        self.data_index = None
+
+    def __len__(self):
+        return len(self.columns['block']) + len(self.staging['block'])
+
+    def ingest(self, records):
+        """Append event records shaped like ChainSim events: {'event', 'args', 'block', 'log_index'}."""
+        for record in records:
+            address_field, data_field, value_field = EVENT_FIELDS.get(record['event'], (None, None, None))
+            args = record.get('args', {})
+            value = args.get(value_field) if value_field else None
+            row = len(self)
+            self.staging['block'].append(record['block'])
+            self.staging['log_index'].append(record.get('log_index', row))
+            self.staging['event'].append(self.events.encode(record['event']))
+            self.staging['address'].append(self.addresses.encode(args.get(address_field) if address_field else None))
+            self.staging['data_id'].append(self.data_ids.encode(args.get(data_field) if data_field else None))
+            self.staging['value'].append(-1 if value is None else int(value))
+            texts = {name: v for name, v in args.items() if isinstance(v, str) and name != address_field}
+            if texts:
+                self.texts[row] = texts
+
+    def ingest_jsonl(self, path):
+        with open(path) as f:
+            self.ingest(json.loads(line) for line in f if line.strip())
+
+    def append_encoded(self, block, event, address, data_id, value, log_index=None):
+        """Bulk-append already dictionary-encoded columns (codes from self.events/addresses/data_ids)."""
+        self.compact()
+        if log_index is None:
+            log_index = np.arange(len(self), len(self) + len(block))
+        new = {'block': block, 'log_index': log_index, 'event': event, 'address': address, 'data_id': data_id, 'value': value}
+        for name, column in self.columns.items():
+            self.columns[name] = np.concatenate([column, np.asarray(new[name], dtype=column.dtype)])
+        self.reindex()
+
+    def compact(self):
+        """Move staged rows into the numpy columns and rebuild the indexes."""
+        if not len(self.staging['block']):
+            return
+        for name, column in self.columns.items():
+            staged = np.frombuffer(self.staging[name], dtype=np.int64).astype(column.dtype)
+            self.columns[name] = np.concatenate([column, staged])
+            self.staging[name] = array('q')
+        self.reindex()
+
+    def reindex(self):
+        block, log_index = self.columns['block'], self.columns['log_index']
+        if len(block) > 1 and ((np.diff(block) < 0) | ((np.diff(block) == 0) & (np.diff(log_index) < 0))).any():
+            order = np.lexsort((log_index, block))
+            for name in self.columns:
+                self.columns[name] = self.columns[name][order]
+            position = np.empty_like(order)
+            position[order] = np.arange(len(order))
+            self.texts = {int(position[row]): texts for row, texts in self.texts.items()}
+        self.address_index = self.build_index(self.columns['address'], len(self.addresses.values))
+        self.data_index = self.build_index(self.columns['data_id'], len(self.data_ids.values))
+
+    @staticmethod
+    def build_index(codes, size):
+        """CSR index: rows of code c are rows[offsets[c]:offsets[c + 1]], in block order."""
+        rows = np.argsort(codes, kind='stable')
+        offsets = np.searchsorted(codes[rows], np.arange(size + 1), side='left')
+        return rows, offsets
+
+    @staticmethod
+    def lookup(index, code):
+        rows, offsets = index
+        return rows[offsets[code]:offsets[code + 1]]
+
+    def last_blocks(self, n):
+        """Block range covering the latest n blocks."""
+        self.compact()
+        latest = int(self.columns['block'][-1]) if len(self.columns['block']) else 0
+        return latest - n + 1, latest
+
+    def query(self, event=None, address=None, data_id=None, blocks=None):
+        """Row numbers matching every given filter; blocks is an inclusive (first, last) range."""
+        self.compact()
+        block = self.columns['block']
+        filters = []
+        for value, dictionary, column, index in ((address, self.addresses, 'address', self.address_index),
+                                                 (data_id, self.data_ids, 'data_id', self.data_index)):
+            if value is not None:
+                code = dictionary.codes.get(value)
+                if code is None:
+                    return np.empty(0, dtype=np.int64)
+                filters.append((len(self.lookup(index, code)), column, code, index))
+        if filters:
+            # start from the most selective index and filter the other columns on its rows
+            filters.sort(key=lambda f: f[0])
+            _, _, code, index = filters[0]
+            candidates = self.lookup(index, code)
+            for _, column, code, _ in filters[1:]:
+                candidates = candidates[self.columns[column][candidates] == code]
+            if blocks is not None:
+                # index rows are in block order, so a block range is a slice
+                candidate_blocks = block[candidates]
+                candidates = candidates[np.searchsorted(candidate_blocks, blocks[0], side='left'):
+                                        np.searchsorted(candidate_blocks, blocks[1], side='right')]
+        elif blocks is not None:
+            candidates = np.arange(np.searchsorted(block, blocks[0], side='left'), np.searchsorted(block, blocks[1], side='right'))
+        else:
+            candidates = np.arange(len(block))
+        if event is not None:
+            code = self.events.codes.get(event)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            candidates = candidates[self.columns['event'][candidates] == code]
+        return candidates
+
+    def rows(self, row_numbers):
+        """Decode rows back into event records."""
+        records = []
+        for row in row_numbers:
+            row = int(row)
+            event = self.events.values[self.columns['event'][row]]
+            address_field, data_field, value_field = EVENT_FIELDS.get(event, (None, None, None))
+            args = dict(self.texts.get(row, {}))
+            # code -1 marks an argument the event did not carry
+            address = self.columns['address'][row]
+            if address_field and address >= 0:
+                args[address_field] = self.addresses.values[address]
+            data_id = self.columns['data_id'][row]
+            if data_field and data_id >= 0:
+                args[data_field] = self.data_ids.values[data_id]
+            value = int(self.columns['value'][row])
+            if value_field and value >= 0:
+                args[value_field] = bool(value) if event == 'AccessControlResult' else value
+            records.append({'event': event, 'args': args, 'block': int(self.columns['block'][row]),
+                            'log_index': int(self.columns['log_index'][row])})
+        return records
+
+if __name__ == "__main__":
+    num_events = 20_000_000
+    num_users = 100_000
+    num_data = 10_000
+    rng = np.random.default_rng(0)
+    store = EventStore()
+    for name in EVENT_FIELDS:
+        store.events.encode(name)
+    for i in range(num_users):
+        store.addresses.encode(f"0x{i:040x}")
+    for i in range(num_data):
+        store.data_ids.encode(i)
+
+    start_time = time.perf_counter()
+    event = rng.integers(0, len(EVENT_FIELDS), num_events)
+    data_id = np.where(np.isin(event, [0, 6]), rng.integers(0, num_data, num_events), -1)
+    store.append_encoded(block=np.arange(num_events) // 50, event=event, address=rng.integers(0, num_users, num_events),
+                         data_id=data_id, value=rng.integers(0, 2, num_events))
+    print(f"Built store with {len(store)} events in {time.perf_counter() - start_time:.2f}s")
+
+    queries = 1000
+    start_time = time.perf_counter()
+    matches = 0
+    for _ in range(queries):
+        user = f"0x{int(rng.integers(num_users)):040x}"
+        matches += len(store.query(event='AccessControlResult', address=user, data_id=int(rng.integers(num_data)),
+                                   blocks=store.last_blocks(100_000)))
+    elapsed = time.perf_counter() - start_time
+    print(f"'access decisions for user X on data Y in the last N blocks': {elapsed / queries * 1000:.3f}ms per query ({matches} matches)")
@@ -1,9 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
-
-# 设置字体为SimHei
-plt.rcParams['font.family'] = 'Times New Roman'
+from ChainSim import Chain, ERTBRMSim, address_for, REPUTATION_SCALE
+from PlotKit import save_and_render
 
 # 定义信誉等级对应的参数和范围
 params = {
@@ -40,82 +38,116 @@ ranges = {
     "L": [0, 4]
 }
 
-# 模拟交易次数
-transaction_count = 100
-# 定义初始信誉等级和初始信誉值
-init_levels = ["H", "M", "L"]
-init_RPs = [10, 5, 1]
-
-plt.figure(figsize=(12,8))
-
-# 对每个初始信誉等级和初始信誉值进行模拟
-for level_0, RP_0 in zip(init_levels, init_RPs):
-    RP_values = [RP_0]
-    level_values = [level_0]
-
-    for transaction in range(1, transaction_count + 1):
-        previous_level = level_values[-1]
-        previous_RP = RP_values[-1]
-        # 根据上次交易的信誉等级获取对应的参数
-        params_for_level = params[previous_level]
-
-        # 获取参数值
-        λ = params_for_level["λ"]
-        τ = params_for_level["τ"]
-        α = params_for_level["α"]
-        γ = params_for_level["γ"]
-        δ = params_for_level["δ"]
-        ε = params_for_level["ε"]
-
-        '''DQ = np.random.randint(0, 4)
-        OT = np.random.randint(0, 4)
-        DS = np.random.randint(0, 4)
-        DI = np.random.randint(0, 4)
-        '''
-        DQ = np.random.randint(4, 8)
-        OT = np.random.randint(4, 8)
-        DS = np.random.randint(4, 8)
-        DI = np.random.randint(4, 8)
-
-        '''
-        DQ = np.random.randint(8, 11)
-        OT = np.random.randint(8, 11)
-        DS = np.random.randint(8, 11)
-        DI = np.random.randint(8, 11)
-        '''
-
-        RP = λ * previous_RP * np.exp(τ * transaction) + (1 - λ) * (
-                α * DQ + γ * OT + δ * DS + ε * DI)
-
-        if RP > 10:
-            RP = 10
-
-        # 判断当前信誉值所在的信誉等级
-        current_level = None
-        for level, range_values in ranges.items():
-            if range_values[0] <= RP < range_values[1]:
-                current_level = level
-                break
-
-        # 存储每次交易后的信誉值和信誉等级
-        RP_values.append(RP)
-        level_values.append(current_level)
-
-    window_size = 15
-    mean_series = pd.Series(RP_values).rolling(window=window_size).mean()
-
-    # 绘制信誉值曲线
-    plt.plot(range(transaction_count + 1), RP_values, label=f"{level_0}",linewidth=4)
-    plt.plot(range(transaction_count + 1), mean_series, linestyle='--', label=f"{level_0}-Average Credit", linewidth=4)
-
-plt.xticks(fontsize=23)
-plt.yticks(fontsize=23)
-plt.xlabel("Transaction Count", fontsize=23)  # 调整 x 轴标签字体大小
-plt.ylabel("Credit Value", fontsize=23)  # 调整 y 轴标签字体大小
-plt.xlim(left=0)
-plt.ylim(0, 10)
-plt.axhline(0, color='black', linewidth=0.5)
-plt.axvline(0, color='black', linewidth=0.5)
-plt.legend(loc='lower right', fontsize=17)
-plt.grid()
-plt.show()
+level_names = list(ranges)
+param_table = np.array([[params[level][name] for name in ("λ", "τ", "α", "γ", "δ", "ε")] for level in level_names])
+
+def classify_levels(RP):
+    """Vectorized level lookup: index into level_names for each value, -1 outside every range."""
+    RP = np.asarray(RP, dtype=float)
+    codes = np.full(RP.shape, -1)
+    for code, level in enumerate(level_names):
+        codes[(RP >= ranges[level][0]) & (RP < ranges[level][1])] = code
+    return codes
+
+def reputation_step(previous_RP, previous_codes, transaction, DQ, OT, DS, DI):
+    """Apply one transaction of the reputation recurrence to arrays of nodes at once."""
+    λ, τ, α, γ, δ, ε = param_table[previous_codes].T
+    RP = λ * previous_RP * np.exp(τ * transaction) + (1 - λ) * (
+            α * DQ + γ * OT + δ * DS + ε * DI)
+    RP = np.minimum(RP, 10)
+    return RP, classify_levels(RP)
+
+if __name__ == "__main__":
+    # 模拟交易次数
+    transaction_count = 100
+    # 定义初始信誉等级和初始信誉值
+    init_levels = ["H", "M", "L"]
+    init_RPs = [10, 5, 1]
+
+    series = []
+
+    # 链上开销：每笔交易都调用一次 ERTBRM.updateReputation
+    chain = Chain()
+    ledger = ERTBRMSim(chain)
+    admin = address_for("admin")
+
+    # 对每个初始信誉等级和初始信誉值进行模拟
+    for level_0, RP_0 in zip(init_levels, init_RPs):
+        RP_values = [RP_0]
+        level_values = [level_0]
+
+        for transaction in range(1, transaction_count + 1):
+            previous_level = level_values[-1]
+            previous_RP = RP_values[-1]
+            # 根据上次交易的信誉等级获取对应的参数
+            params_for_level = params[previous_level]
+
+            # 获取参数值
+            λ = params_for_level["λ"]
+            τ = params_for_level["τ"]
+            α = params_for_level["α"]
+            γ = params_for_level["γ"]
+            δ = params_for_level["δ"]
+            ε = params_for_level["ε"]
+
+            '''DQ = np.random.randint(0, 4)
+            OT = np.random.randint(0, 4)
+            DS = np.random.randint(0, 4)
+            DI = np.random.randint(0, 4)
+            '''
+            DQ = np.random.randint(4, 8)
+            OT = np.random.randint(4, 8)
+            DS = np.random.randint(4, 8)
+            DI = np.random.randint(4, 8)
+
+            '''
+            DQ = np.random.randint(8, 11)
+            OT = np.random.randint(8, 11)
+            DS = np.random.randint(8, 11)
+            DI = np.random.randint(8, 11)
+            '''
+
+            RP = λ * previous_RP * np.exp(τ * transaction) + (1 - λ) * (
+                    α * DQ + γ * OT + δ * DS + ε * DI)
+
+            if RP > 10:
+                RP = 10
+
+            # 判断当前信誉值所在的信誉等级
+            current_level = None
+            for level, range_values in ranges.items():
+                if range_values[0] <= RP < range_values[1]:
+                    current_level = level
+                    break
+
+            # 存储每次交易后的信誉值和信誉等级
+            RP_values.append(RP)
+            level_values.append(current_level)
+            ledger.updateReputation(admin, address_for(level_0), int(RP * REPUTATION_SCALE))
+
+        window_size = 15
+        mean_series = pd.Series(RP_values).rolling(window=window_size).mean()
+
+        # 绘制信誉值曲线
+        x = np.arange(transaction_count + 1)
+        series.append({'label': f"{level_0}", 'x': x, 'y': np.array(RP_values), 'style': {'linewidth': 4}})
+        series.append({'label': f"{level_0}-Average Credit", 'x': x, 'y': mean_series.to_numpy(),
+                       'style': {'linestyle': '--', 'linewidth': 4}})
+
+    # 保存原始数据并绘图（长序列会先降采样）
+    spec = {
+        'series': series,
+        'xlabel': "Transaction Count",
+        'ylabel': "Credit Value",
+        'fontsize': 23,
+        'xlim': [0, None],
+        'ylim': [0, 10],
+        'hlines': [0],
+        'vlines': [0],
+        'legend_loc': 'lower right',
+        'legend_fontsize': 17,
+        'figsize': [12, 8],
+        'rc': {'font.family': 'Times New Roman'},  # 设置字体
+    }
+    print(save_and_render(spec, 'result', 'MRM_Credit_Value'))
+    chain.print_report()
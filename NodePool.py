@@ -0,0 +1,108 @@
+import numpy as np
+
+# Array form of the node population used by AccTim100.py / AccTim1000.py / Std_Mean.py: one numpy array
+# per node field instead of a list of dicts, so selection and the per-task updates run as vector
+# operations. The selection and update rules are the same as select_nodes / update_accuracy /
+# update_consecutive_selections / update_speed, including their tie-breaking order.
+# A pool may carry a boolean 'active' array (see Population.py); inactive nodes are then neither selected
+# nor updated.
+
+BEHAVIORS = ['stable', 'declining', 'random']
+STABLE, DECLINING, RANDOM = range(len(BEHAVIORS))
+ACCURACY_RANGES = np.array([[0.5, 0.8], [0.2, 0.4], [0.3, 0.7]])
+
+NUM_CANDIDATES = 30
+COMMITTEE_SIZE = 7
+
+def initialize_pool(num_nodes=100, behavior_probs=[0.6, 0.2, 0.2], rng=None):
+    """Draw a whole population at once; rng is a numpy Generator or a seed."""
+    rng = np.random.default_rng(rng)
+    behavior = rng.choice(len(BEHAVIORS), size=num_nodes, p=behavior_probs)
+    return {
+        'behavior': behavior,
+        'load': rng.uniform(10, 15, num_nodes),
+        'time': np.zeros(num_nodes),
+        'positive_streak': np.zeros(num_nodes, dtype=np.int64),
+        'negative_streak': np.zeros(num_nodes, dtype=np.int64),
+        'accuracy': rng.uniform(ACCURACY_RANGES[behavior, 0], ACCURACY_RANGES[behavior, 1]),
+        'consecutive_selections': np.zeros(num_nodes, dtype=np.int64),
+        'speed': np.full(num_nodes, 10.0),
+    }
+
+def pool_from_nodes(nodes):
+    """Convert the list-of-dicts population built by initialize_nodes."""
+    pool = {'behavior': np.array([BEHAVIORS.index(node['behavior']) for node in nodes])}
+    for field in ('load', 'time', 'accuracy', 'speed'):
+        pool[field] = np.array([node[field] for node in nodes], dtype=float)
+    for field in ('positive_streak', 'negative_streak', 'consecutive_selections'):
+        pool[field] = np.array([node[field] for node in nodes], dtype=np.int64)
+    return pool
+
+def smallest_k(values, indices, k):
+    """The k indices with the smallest (value, index), in that order."""
+    if len(indices) > k:
+        kth = np.partition(values, k - 1)[k - 1]
+        keep = values <= kth
+        values, indices = values[keep], indices[keep]
+    return indices[np.lexsort((indices, values))[:k]]
+
+def eligible_indices(pool, mask=None):
+    """Indices of the nodes a selection may pick: active ones, further restricted by mask."""
+    if 'active' in pool:
+        mask = pool['active'] if mask is None else mask & pool['active']
+    return np.arange(len(pool['load'])) if mask is None else np.flatnonzero(mask)
+
+def select_pool(pool, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """Dynamic selection: the num_candidates lowest load/speed, then the committee_size most accurate of those.
+
+    mask restricts selection to a subset of nodes (e.g. idle ones)."""
+    indices = eligible_indices(pool, mask)
+    candidates = smallest_k(pool['load'][indices] / pool['speed'][indices], indices, num_candidates)
+    # accuracy descending, ties broken by descending index like sort(reverse=True) on (accuracy, idx)
+    order = np.lexsort((-candidates, -pool['accuracy'][candidates]))
+    return candidates[order[:committee_size]]
+
+def cast_votes(pool, indices, rng):
+    """Each selected node votes once: stable nodes True, declining False, random nodes a fair coin."""
+    behavior = pool['behavior'][indices]
+    return (behavior == STABLE) | ((behavior == RANDOM) & (rng.random(len(indices)) < 0.5))
+
+def update_pool(pool, indices, votes, duration):
+    """Apply one executed task to the population; returns (majority decision, task completion time)."""
+    majority = votes.sum() > len(votes) / 2
+    apply_task(pool, indices, votes, majority, duration)
+    return majority, pool['time'][indices].max()
+
+def apply_task(pool, indices, votes, majority, duration):
+    """The per-node part of update_pool, given the committee's majority. indices may cover only part of the
+    committee (or none of it), e.g. the members owned by one shard; unselected nodes still recover."""
+    pool['time'][indices] += duration / pool['speed'][indices]
+    pool['load'][indices] += pool['time'][indices]
+
+    agree = votes == majority
+    agreeing, disagreeing = indices[agree], indices[~agree]
+    pool['positive_streak'][agreeing] += 1
+    pool['negative_streak'][agreeing] = 0
+    accuracy = pool['accuracy'][agreeing]
+    pool['accuracy'][agreeing] = np.minimum(accuracy + (1 - accuracy) * 0.05 * pool['positive_streak'][agreeing], 1)
+    pool['negative_streak'][disagreeing] += 1
+    pool['positive_streak'][disagreeing] = 0
+    accuracy = pool['accuracy'][disagreeing]
+    pool['accuracy'][disagreeing] = np.maximum(accuracy - accuracy * 0.1 * pool['negative_streak'][disagreeing], 0)
+
+    selected_speed = np.maximum(5, pool['speed'][indices] - 0.1 * duration)
+    if 'active' in pool:
+        active = pool['active']
+        pool['consecutive_selections'][active] -= 1
+        pool['speed'][active] = np.minimum(pool['speed'][active] + 0.1, 15)
+    else:
+        pool['consecutive_selections'] -= 1
+        np.minimum(pool['speed'] + 0.1, 15, out=pool['speed'])
+    pool['consecutive_selections'][indices] += 2
+    pool['speed'][indices] = selected_speed
+
+def execute_task(pool, duration, rng, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """Array counterpart of execute_cumulative_tasks: select, vote once, update; returns (decision, task time)."""
+    selected = select_pool(pool, mask, num_candidates, committee_size)
+    votes = cast_votes(pool, selected, rng)
+    return update_pool(pool, selected, votes, duration)
@@ -1,9 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
-
-# Set font to Times New Roman
-plt.rcParams['font.family'] = 'Times New Roman'
+from PlotKit import save_and_render
 
 # Define parameters for Credit Levels A
 params_A = {
@@ -36,7 +33,7 @@ transaction_count = 200
 init_levels = ["L"]
 init_RPs = [1]
 
-plt.figure(figsize=(12, 8))
+series = []
 
 # Simulate for parameters A
 for level_0, RP_0 in zip(init_levels, init_RPs):
@@ -78,8 +75,8 @@ for level_0, RP_0 in zip(init_levels, init_RPs):
     window_size = 15
     mean_series = pd.Series(RP_values).rolling(window=window_size).mean()
 
-    plt.plot(range(transaction_count + 1), RP_values, label=f"$λ_A$_${level_0}$_$RepV$",marker='^',markevery=0.2,
-        markersize=12,linewidth=3)
+    series.append({'label': f"$λ_A$_${level_0}$_$RepV$", 'x': np.arange(transaction_count + 1), 'y': np.array(RP_values),
+                   'style': {'marker': '^', 'markevery': 0.2, 'markersize': 12, 'linewidth': 3}})
 
 # Simulate for parameters B
 for level_0, RP_0 in zip(init_levels, init_RPs):
@@ -121,8 +118,8 @@ for level_0, RP_0 in zip(init_levels, init_RPs):
     window_size = 15
     mean_series = pd.Series(RP_values).rolling(window=window_size).mean()
 
-    plt.plot(range(transaction_count + 1), RP_values, label=f"$λ_B$_${level_0}$_$RepV$",marker='*',markevery=0.2,
-        markersize=12,linewidth=3)
+    series.append({'label': f"$λ_B$_${level_0}$_$RepV$", 'x': np.arange(transaction_count + 1), 'y': np.array(RP_values),
+                   'style': {'marker': '*', 'markevery': 0.2, 'markersize': 12, 'linewidth': 3}})
 
 # Simulate for parameters C
 for level_0, RP_0 in zip(init_levels, init_RPs):
@@ -164,17 +161,23 @@ for level_0, RP_0 in zip(init_levels, init_RPs):
     window_size = 15
     mean_series = pd.Series(RP_values).rolling(window=window_size).mean()
 
-    plt.plot(range(transaction_count + 1), RP_values , label=f"$λ_C$_${level_0}$_$RepV$", linewidth=3,marker='o',markevery=0.2,
-        markersize=12)
-
-plt.xticks(fontsize=23)
-plt.yticks(fontsize=23)
-plt.xlabel("Share Count", fontsize=25)
-plt.ylabel("Reputation Value", fontsize=25)
-plt.xlim(left=0)
-plt.ylim(bottom=0,top=10)
-plt.axhline(0, color='black', linewidth=0.5)
-plt.axvline(0, color='black', linewidth=0.5)
-plt.legend(loc='lower right', fontsize=23)
-plt.grid()
-plt.show()
+    series.append({'label': f"$λ_C$_${level_0}$_$RepV$", 'x': np.arange(transaction_count + 1), 'y': np.array(RP_values),
+                   'style': {'linewidth': 3, 'marker': 'o', 'markevery': 0.2, 'markersize': 12}})
+
+# Save the raw trajectories and render them (long series are downsampled first)
+spec = {
+    'series': series,
+    'xlabel': "Share Count",
+    'ylabel': "Reputation Value",
+    'fontsize': 23,
+    'label_fontsize': 25,
+    'xlim': [0, None],
+    'ylim': [0, 10],
+    'hlines': [0],
+    'vlines': [0],
+    'legend_loc': 'lower right',
+    'legend_fontsize': 23,
+    'figsize': [12, 8],
+    'rc': {'font.family': 'Times New Roman'},
+}
+print(save_and_render(spec, 'result', 'Para_Reputation_Value'))
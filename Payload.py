@@ -0,0 +1,67 @@
+import time
+from Crypto.Cipher import AES, ChaCha20_Poly1305
+from Crypto.Random import get_random_bytes
+
+# AEAD payload layer for the encrypted data stores. Every record starts with a one-byte mode id, so
+# records written under different modes can sit in the same store:
+#   mode id (1 byte) | nonce | ciphertext | tag (16 bytes)
+
+AEAD_MODES = {
+    'EAX': {'id': 1, 'key_size': 16, 'nonce_size': 16},
+    'GCM': {'id': 2, 'key_size': 16, 'nonce_size': 12},
+    'ChaCha20-Poly1305': {'id': 3, 'key_size': 32, 'nonce_size': 12},
+}
+MODE_BY_ID = {spec['id']: name for name, spec in AEAD_MODES.items()}
+TAG_SIZE = 16
+DEFAULT_AEAD_MODE = 'GCM'
+# Callers hand in this much key material; each mode uses the first key_size bytes of it
+KEY_MATERIAL_SIZE = max(spec['key_size'] for spec in AEAD_MODES.values())
+
+def new_cipher(mode, key, nonce):
+    if mode == 'ChaCha20-Poly1305':
+        return ChaCha20_Poly1305.new(key=key, nonce=nonce)
+    return AES.new(key, AES.MODE_GCM if mode == 'GCM' else AES.MODE_EAX, nonce=nonce)
+
+def key_size(mode):
+    return AEAD_MODES[mode]['key_size']
+
+def record_mode(record):
+    """AEAD mode a record was written with, read from its header byte."""
+    return MODE_BY_ID[record[0]]
+
+def aead_encrypt(data, key, mode=DEFAULT_AEAD_MODE):
+    nonce = get_random_bytes(AEAD_MODES[mode]['nonce_size'])
+    ciphertext, tag = new_cipher(mode, key[:key_size(mode)], nonce).encrypt_and_digest(data)
+    return bytes([AEAD_MODES[mode]['id']]) + nonce + ciphertext + tag
+
+def aead_decrypt(record, key):
+    mode = record_mode(record)
+    nonce_end = 1 + AEAD_MODES[mode]['nonce_size']
+    record = memoryview(record)
+    return new_cipher(mode, key[:key_size(mode)], bytes(record[1:nonce_end])).decrypt_and_verify(record[nonce_end:-TAG_SIZE], record[-TAG_SIZE:])
+
+def benchmark_modes(sizes=(1 << 10, 10 << 10, 100 << 10, 1 << 20, 10 << 20, 100 << 20), modes=tuple(AEAD_MODES), min_bytes=200 << 20):
+    """Encrypt/decrypt throughput in MB/s per (mode, payload size)."""
+    results = []
+    for size in sizes:
+        data = get_random_bytes(size)
+        runs = max(3, min_bytes // size)
+        for mode in modes:
+            key = get_random_bytes(key_size(mode))
+            start_time = time.perf_counter()
+            for _ in range(runs):
+                record = aead_encrypt(data, key, mode)
+            encrypt_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            for _ in range(runs):
+                aead_decrypt(record, key)
+            decrypt_time = time.perf_counter() - start_time
+            megabytes = size * runs / (1 << 20)
+            results.append({'mode': mode, 'size': size, 'encrypt_mb_s': megabytes / encrypt_time,
+                            'decrypt_mb_s': megabytes / decrypt_time})
+    return results
+
+if __name__ == "__main__":
+    print(f"{'mode':<18} {'size':>10} {'encrypt MB/s':>13} {'decrypt MB/s':>13}")
+    for r in benchmark_modes():
+        print(f"{r['mode']:<18} {r['size']:>10} {r['encrypt_mb_s']:>13.1f} {r['decrypt_mb_s']:>13.1f}")
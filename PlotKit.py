@@ -0,0 +1,148 @@
+import datetime
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')  # render to files only, never block on a window
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Plotting layer for long reputation / accuracy trajectories. A figure is described by a spec dict:
+#   {'series': [{'label', 'x', 'y', 'style': {...plt.plot kwargs}}], 'xlabel', 'ylabel', 'title',
+#    'xlim', 'ylim', 'hlines', 'vlines', 'fontsize', 'label_fontsize', 'legend_loc', 'legend_fontsize',
+#    'grid', 'figsize', 'rc'}
+# Specs are saved as .npz (arrays plus the JSON spec) so figures can be regenerated without re-running a
+# simulation, and every series is downsampled shape-preservingly before it reaches matplotlib.
+
+MAX_POINTS = 2000
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: threshold points that keep the visual shape of (x, y)."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        area = np.abs((x[previous] - next_x) * (bucket_y - y[previous]) - (x[previous] - bucket_x) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        keep[i + 1] = previous
+    return x[keep], y[keep]
+
+def minmax(x, y, threshold):
+    """Min/max bucketing: the endpoints plus the lowest and highest point of each of threshold // 2 buckets, in x order."""
+    n = len(x)
+    num_buckets = threshold // 2
+    if num_buckets < 1 or n <= threshold:
+        return x, y
+    # Bucket edges cover all n points, so the tail is reduced like the rest of the series
+    edges = np.linspace(0, n, num_buckets + 1).astype(int)[:-1]
+    bucket = np.repeat(np.arange(num_buckets), np.diff(np.append(edges, n)))
+    keep = [[0, n - 1]]
+    for extreme in (np.minimum.reduceat(y, edges), np.maximum.reduceat(y, edges)):
+        hits = np.flatnonzero(y == extreme[bucket])
+        keep.append(hits[np.unique(bucket[hits], return_index=True)[1]])  # first hit per bucket
+    keep = np.unique(np.concatenate(keep))
+    return x[keep], y[keep]
+
+DOWNSAMPLERS = {
+    'lttb': lttb,
+    'minmax': minmax,
+}
+
+def downsample(x, y, max_points=MAX_POINTS, method='lttb'):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(y)
+    if not finite.all():  # e.g. the leading NaNs of a rolling mean
+        x, y = x[finite], y[finite]
+    return DOWNSAMPLERS[method](x, y, max_points)
+
+def save_figure_data(path, spec):
+    """Write a spec's arrays and settings to an .npz file."""
+    arrays = {}
+    meta = {key: value for key, value in spec.items() if key != 'series'}
+    meta['series'] = []
+    for i, series in enumerate(spec['series']):
+        arrays[f'x{i}'] = np.asarray(series['x'])
+        arrays[f'y{i}'] = np.asarray(series['y'])
+        meta['series'].append({'label': series.get('label'), 'style': series.get('style', {})})
+    np.savez_compressed(path, spec=json.dumps(meta), **arrays)
+
+def load_figure_data(path):
+    with np.load(path) as data:
+        spec = json.loads(str(data['spec']))
+        for i, series in enumerate(spec['series']):
+            series['x'] = data[f'x{i}']
+            series['y'] = data[f'y{i}']
+    return spec
+
+def render_figure(spec, path, max_points=MAX_POINTS, method='lttb'):
+    """Render one spec to an image file with the Agg backend."""
+    with plt.rc_context(spec.get('rc', {})):
+        figure = plt.figure(figsize=spec.get('figsize', (12, 8)))
+        fontsize = spec.get('fontsize')
+        for series in spec['series']:
+            x, y = downsample(series['x'], series['y'], max_points, method)
+            plt.plot(x, y, label=series.get('label'), **series.get('style', {}))
+        for y in spec.get('hlines', []):
+            plt.axhline(y, color='black', linewidth=0.5)
+        for x in spec.get('vlines', []):
+            plt.axvline(x, color='black', linewidth=0.5)
+        if fontsize:
+            plt.xticks(fontsize=fontsize)
+            plt.yticks(fontsize=fontsize)
+        plt.xlabel(spec.get('xlabel', ''), fontsize=spec.get('label_fontsize', fontsize))
+        plt.ylabel(spec.get('ylabel', ''), fontsize=spec.get('label_fontsize', fontsize))
+        if spec.get('title'):
+            plt.title(spec['title'])
+        if spec.get('xlim'):
+            plt.xlim(*spec['xlim'])
+        if spec.get('ylim'):
+            plt.ylim(*spec['ylim'])
+        plt.legend(loc=spec.get('legend_loc', 'best'), fontsize=spec.get('legend_fontsize'))
+        if spec.get('grid', True):
+            plt.grid(True)
+        figure.savefig(path)
+        plt.close(figure)
+    return path
+
+def render_job(job):
+    source, path, max_points, method = job
+    spec = load_figure_data(source) if isinstance(source, str) else source
+    return render_figure(spec, path, max_points, method)
+
+def render_batch(jobs, processes=None, max_points=MAX_POINTS, method='lttb'):
+    """Render many (spec or .npz path, image path) pairs in parallel worker processes."""
+    jobs = [(source, path, max_points, method) for source, path in jobs]
+    if processes == 1 or len(jobs) == 1:
+        return [render_job(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(render_job, jobs)
+
+def save_and_render(spec, directory, base_filename, timestamp=True, max_points=MAX_POINTS, method='lttb'):
+    """Save a spec's data as <base>[_timestamp].npz next to its rendered .png; returns the .png path."""
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    if timestamp:
+        base_filename = f"{base_filename}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    base = os.path.join(directory, base_filename)
+    save_figure_data(base + '.npz', spec)
+    return render_figure(spec, base + '.png', max_points, method)
+
+if __name__ == "__main__":
+    # Regenerate figures from saved data: python PlotKit.py [--minmax] [--points N] a.npz b.npz ...
+    args = sys.argv[1:]
+    method = 'minmax' if '--minmax' in args else 'lttb'
+    max_points = int(args[args.index('--points') + 1]) if '--points' in args else MAX_POINTS
+    sources = [a for a in args if a.endswith('.npz')]
+    for path in render_batch([(source, source[:-4] + '.png') for source in sources], max_points=max_points, method=method):
+        print(path)
@@ -0,0 +1,79 @@
+import re
+from functools import lru_cache
+
+# Pure-Python evaluation of CP-ABE access policies such as '((ONE or THREE) and (TWO or FOUR))',
+# used to reject requests before any pairing work. Matching is deliberately lenient (case and
+# charm's '_index' suffix are ignored), so a policy is never rejected here that charm would accept.
+
+TOKEN_PATTERN = re.compile(r'\s*(\(|\)|[^\s()]+)')
+
+def normalize_attribute(attribute):
+    return str(attribute).upper().split('_')[0]
+
+def tokenize(policy):
+    tokens = []
+    position = 0
+    policy = policy.strip()
+    while position < len(policy):
+        match = TOKEN_PATTERN.match(policy, position)
+        if match is None:
+            raise ValueError(f"Cannot tokenize policy: {policy!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+@lru_cache(maxsize=1024)
+def parse_policy(policy):
+    """Parse a policy into nested ('and'|'or', left, right) tuples with attribute leaves, or None if unsupported."""
+    try:
+        tokens = tokenize(policy)
+        tree, position = parse_or(tokens, 0)
+    except (ValueError, IndexError):
+        return None
+    return tree if position == len(tokens) else None
+
+def parse_or(tokens, position):
+    left, position, mixed = parse_and(tokens, position)
+    while position < len(tokens) and tokens[position].lower() == 'or':
+        right, position, right_mixed = parse_and(tokens, position + 1)
+        mixed = mixed or right_mixed
+        left = ('or', left, right)
+    if mixed and left[0] == 'or':
+        # 'A or B and C' without parentheses: precedence is parser-specific, leave it to charm
+        raise ValueError("Ambiguous mix of 'and' and 'or' in policy")
+    return left, position
+
+def parse_and(tokens, position):
+    left, position = parse_leaf(tokens, position)
+    has_and = False
+    while position < len(tokens) and tokens[position].lower() == 'and':
+        right, position = parse_leaf(tokens, position + 1)
+        left = ('and', left, right)
+        has_and = True
+    return left, position, has_and
+
+def parse_leaf(tokens, position):
+    token = tokens[position]
+    if token == '(':
+        tree, position = parse_or(tokens, position + 1)
+        if tokens[position] != ')':
+            raise ValueError("Unbalanced parentheses in policy")
+        return tree, position + 1
+    if token == ')' or token.lower() in ('and', 'or'):
+        raise ValueError(f"Unexpected token in policy: {token!r}")
+    return normalize_attribute(token), position + 1
+
+def evaluate(tree, attributes):
+    if isinstance(tree, str):
+        return tree in attributes
+    op, left, right = tree
+    if op == 'and':
+        return evaluate(left, attributes) and evaluate(right, attributes)
+    return evaluate(left, attributes) or evaluate(right, attributes)
+
+def policy_satisfied(policy, attributes):
+    """True/False if the attribute set does/does not satisfy the policy, None if the policy cannot be parsed."""
+    tree = parse_policy(policy)
+    if tree is None:
+        return None
+    return evaluate(tree, {normalize_attribute(a) for a in attributes})
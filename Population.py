@@ -0,0 +1,113 @@
+import time
+import numpy as np
+
+from NodePool import initialize_pool, execute_task, STABLE, DECLINING, NUM_CANDIDATES, COMMITTEE_SIZE
+
+# Scenario generator for large, changing populations. A population is a NodePool pool with an 'active'
+# mask and spare capacity: nodes join into free slots (the arrays grow by doubling when none are left),
+# leave by being masked out, and stable nodes can turn declining mid-run. Churn is applied between tasks
+# without rebuilding the population, and select_pool / update_pool only ever touch active nodes.
+
+# Expected number of events per churn step
+DEFAULT_CHURN = {'join': 5.0, 'leave': 5.0, 'decline': 1.0}
+
+def new_population(num_nodes, behavior_probs=[0.6, 0.2, 0.2], capacity=None, rng=None):
+    rng = np.random.default_rng(rng)
+    capacity = max(capacity or num_nodes, num_nodes)
+    pool = initialize_pool(capacity, behavior_probs, rng)
+    pool['active'] = np.zeros(capacity, dtype=bool)
+    pool['active'][:num_nodes] = True
+    return pool
+
+def active_count(pool):
+    return int(np.count_nonzero(pool['active']))
+
+def grow(pool, capacity):
+    """Extend every field to capacity slots; the new slots start inactive."""
+    extra = capacity - len(pool['active'])
+    if extra <= 0:
+        return
+    for field, values in pool.items():
+        pool[field] = np.concatenate([values, np.zeros(extra, dtype=values.dtype)])
+
+def join(pool, count, behavior_probs=[0.6, 0.2, 0.2], rng=None):
+    """Add count fresh nodes, reusing slots of departed nodes first; returns their indices."""
+    free = np.flatnonzero(~pool['active'])[:count]
+    if len(free) < count:
+        size = len(pool['active'])
+        grow(pool, max(2 * size, size + count - len(free)))
+        free = np.flatnonzero(~pool['active'])[:count]
+    fresh = initialize_pool(count, behavior_probs, rng)
+    for field, values in fresh.items():
+        pool[field][free] = values
+    pool['active'][free] = True
+    return free
+
+def leave(pool, count, rng):
+    """Deactivate count random active nodes; returns their indices."""
+    active = np.flatnonzero(pool['active'])
+    leaving = rng.choice(active, min(count, len(active)), replace=False)
+    pool['active'][leaving] = False
+    return leaving
+
+def change_behavior(pool, count, rng, source=STABLE, target=DECLINING):
+    """Switch count random active nodes from one behavior to another, keeping their accumulated accuracy."""
+    eligible = np.flatnonzero(pool['active'] & (pool['behavior'] == source))
+    changed = rng.choice(eligible, min(count, len(eligible)), replace=False)
+    pool['behavior'][changed] = target
+    return changed
+
+def apply_churn(pool, rng, churn=DEFAULT_CHURN, behavior_probs=[0.6, 0.2, 0.2], min_active=NUM_CANDIDATES):
+    """One churn step with Poisson event counts; returns the counts applied."""
+    counts = {event: int(rng.poisson(rate)) for event, rate in churn.items()}
+    counts['leave'] = min(counts.get('leave', 0), max(0, active_count(pool) - min_active))
+    if counts.get('join'):
+        join(pool, counts['join'], behavior_probs, rng)
+    if counts['leave']:
+        leave(pool, counts['leave'], rng)
+    if counts.get('decline'):
+        counts['decline'] = len(change_behavior(pool, counts['decline'], rng))
+    return counts
+
+def run_scenario(num_nodes=1000000, num_tasks=1000, churn=DEFAULT_CHURN, churn_every=1, behavior_probs=[0.6, 0.2, 0.2],
+                 durations=(5, 10, 15), num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE, seed=None):
+    """Tasks on a churning population; returns accuracy, completion time and population trajectory."""
+    rng = np.random.default_rng(seed)
+    pool = new_population(num_nodes, behavior_probs, rng=rng)
+    task_durations = rng.choice(durations, num_tasks)
+    totals = {'join': 0, 'leave': 0, 'decline': 0}
+    active_nodes = np.empty(num_tasks, dtype=np.int64)
+    correct = 0
+    total_time = 0.0
+    churn_time = 0.0
+    start_time = time.perf_counter()
+    for task, duration in enumerate(task_durations):
+        decision, task_time = execute_task(pool, duration, rng, num_candidates=num_candidates, committee_size=committee_size)
+        correct += bool(decision)
+        total_time += float(task_time)
+        if (task + 1) % churn_every == 0:
+            churn_start = time.perf_counter()
+            for event, count in apply_churn(pool, rng, churn, behavior_probs, num_candidates).items():
+                totals[event] = totals.get(event, 0) + count
+            churn_time += time.perf_counter() - churn_start
+        active_nodes[task] = active_count(pool)
+    elapsed = time.perf_counter() - start_time
+    return {
+        'accuracy': correct / num_tasks * 100,
+        'task_time': total_time,
+        'active_nodes': active_nodes,
+        'capacity': len(pool['active']),
+        'churn': totals,
+        'ms_per_task': elapsed / num_tasks * 1000,
+        'churn_ms_per_step': churn_time / max(1, num_tasks // churn_every) * 1000,
+    }
+
+if __name__ == "__main__":
+    for num_nodes in (10000, 100000, 1000000):
+        start_time = time.perf_counter()
+        new_population(num_nodes, rng=0)
+        build_time = time.perf_counter() - start_time
+        scenario = run_scenario(num_nodes, num_tasks=500, churn={'join': num_nodes * 0.001, 'leave': num_nodes * 0.001, 'decline': num_nodes * 0.0005}, seed=0)
+        print(f"{num_nodes:>8} nodes: built in {build_time * 1000:.0f} ms, {scenario['ms_per_task']:.2f} ms/task "
+              f"(churn {scenario['churn_ms_per_step']:.2f} ms/step), accuracy {scenario['accuracy']:.1f}%, "
+              f"active {scenario['active_nodes'][-1]}/{scenario['capacity']}, churn {scenario['churn']}")
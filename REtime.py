@@ -1,39 +1,39 @@
 import time
 import matplotlib.pyplot as plt
-from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 from Crypto.PublicKey import RSA
 from Crypto.Cipher import PKCS1_OAEP
-from charm.toolbox.pairinggroup import PairingGroup, GT
-from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.toolbox.pairinggroup import GT
+from charm.core.engine.util import objectToBytes, bytesToObject
 import hashlib
 import base64
 import uuid
 import json
+import os
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Assuming the 'config' module and functions are correctly defined and imported
 from config import users, data_sets, update_attributes_based_on_reputation, REPUTATION_REQUIREMENTS
-
-group = PairingGroup('SS512')
-cpabe = CPabe_BSW07(group)
-(pk, mk) = cpabe.setup()
-
-def generate_key_from_element(group, element):
+from Backends import DEFAULT_BACKEND, LEVEL_BACKENDS, get_backend, backend_for_level
+from Policy import policy_satisfied
+from ChainSim import Chain, ABETokenAccessControlSim, address_for
+from Trace import Tracer, Histogram
+from Payload import DEFAULT_AEAD_MODE, KEY_MATERIAL_SIZE, aead_encrypt, aead_decrypt
+from ShmStore import SharedRecordStore
+from Tokens import TokenSigner, is_stateless, parse_keys
+
+default_backend = get_backend(*DEFAULT_BACKEND)
+group, cpabe, pk, mk = default_backend['group'], default_backend['cpabe'], default_backend['pk'], default_backend['mk']
+
+def generate_key_from_element(group, element, length=16):
 	if not group.ismember(element):
 		raise ValueError("Element is not a valid group member")
 	serialized_element = group.serialize(element)
-	hashed_key = hashlib.sha256(serialized_element).digest()[:16]
+	hashed_key = hashlib.sha256(serialized_element).digest()[:length]
 	return hashed_key
 
-def aes_encrypt(data, key):
-	cipher_aes = AES.new(key, AES.MODE_EAX)
-	nonce, ciphertext, tag = cipher_aes.nonce, *cipher_aes.encrypt_and_digest(data)
-	return nonce, ciphertext, tag
-
-def aes_decrypt(nonce, ciphertext, tag, key):
-	cipher_aes = AES.new(key, AES.MODE_EAX, nonce=nonce)
-	return cipher_aes.decrypt_and_verify(ciphertext, tag)
-
 def generate_rsa_keys():
 	key = RSA.generate(2048)
 	return key.export_key(), key.publickey().export_key()
@@ -49,93 +49,269 @@ def rsa_decrypt(encrypted_data, private_key):
 	return cipher_rsa.decrypt(encrypted_data)
 
 tokens = {}
-
-def generate_token(user_id, data_id, expiration=3600):
+# Keys for stateless tokens. Every process that issues or validates them must hold the same keys: set
+# RETIME_TOKEN_KEYS (Tokens.format_keys) before import, or call install_token_keys in each worker.
+# Revocations are local to the process that made them.
+token_signer = TokenSigner(parse_keys(os.environ.get('RETIME_TOKEN_KEYS', '')))
+
+# (user_id, attributes, policy) -> access decision, checked before any pairing work
+policy_decisions = {}
+POLICY_DECISION_CACHE_SIZE = 100000
+# Latency of requests rejected by the policy pre-check, reported apart from granted requests whether or not
+# tracing is on; a fixed-size histogram, so a flood of denied requests does not grow it
+rejection_latency = Histogram()
+rejection_lock = threading.Lock()
+# Step latency histograms and grant/denial counters for the access path; RETIME_TRACE=0 turns it into a no-op
+tracer = Tracer(enabled=os.environ.get('RETIME_TRACE', '1') != '0')
+
+def traced(scheme):
+	# Feed a request function's step_times and outcome into the tracer as '<scheme>.<step>' histograms
+	def decorator(request):
+		@functools.wraps(request)
+		def wrapper(*args, **kwargs):
+			result, step_times, total_time = request(*args, **kwargs)
+			for step, seconds in step_times.items():
+				if seconds:
+					tracer.record(f"{scheme}.{step}", seconds)
+			tracer.record(f"{scheme}.total", total_time)
+			tracer.increment(f"{scheme}.grants" if result.startswith("Access granted") else f"{scheme}.denials")
+			return result, step_times, total_time
+		return wrapper
+	return decorator
+
+def record_rejection(seconds):
+	with rejection_lock:
+		rejection_latency.record(int(seconds * 1e9))
+	tracer.record('abe.rejection', seconds)
+
+def policy_allows(user_id, attributes, policy):
+	# True/False from the pure-Python policy check, None when the policy has to be left to charm
+	cache_key = (user_id, frozenset(attributes), policy)
+	if cache_key not in policy_decisions:
+		if len(policy_decisions) >= POLICY_DECISION_CACHE_SIZE:
+			policy_decisions.clear()
+		policy_decisions[cache_key] = policy_satisfied(policy, attributes)
+	return policy_decisions[cache_key]
+
+def generate_token(user_id, data_id, expiration=3600, stateless=False):
+	if stateless:
+		return token_signer.issue(user_id, data_id, expiration)
 	token = str(uuid.uuid4())
 	token_data = {'user_id': user_id, 'data_id': data_id, 'expires': time.time() + expiration}
 	tokens[token] = token_data
 	return token
 
+def validate_token(token):
+	# Metadata of a live token, from the tokens dict or from a stateless token's own payload
+	if is_stateless(token):
+		return token_signer.validate(token)
+	token_data = tokens.get(token)
+	if token_data is None or token_data['expires'] < time.time():
+		return None
+	return token_data
+
+def token_covers(token_data, data_id):
+	# A token is issued for one data id or for a list of data ids
+	covered = token_data['data_id']
+	return covered == data_id or (isinstance(covered, (list, tuple, set, frozenset)) and data_id in covered)
+
+def issue_user_keys(user_info):
+	# One secret key per backend in use; 'sk' stays the default-backend key
+	user_info['sks'] = {}
+	for name in set(LEVEL_BACKENDS.values()) | {DEFAULT_BACKEND}:
+		backend = get_backend(*name)
+		user_info['sks'][name] = backend['cpabe'].keygen(backend['pk'], backend['mk'], user_info['attributes'])
+	user_info['sk'] = user_info['sks'][DEFAULT_BACKEND]
+
 def initialize_user_keys_abe():
 	for user_id, user_info in users.items():
-		user_info['sk'] = cpabe.keygen(pk, mk, user_info['attributes'])
+		issue_user_keys(user_info)
 
-def initialize_encrypted_data_abe():
+def initialize_encrypted_data_abe(mode=DEFAULT_AEAD_MODE):
 	encrypted_data = {}
 	for ds_id, ds_content in data_sets.items():
 		encrypted_data[ds_id] = {}
 		for level, content in ds_content.items():
 			if level != 'policy':
-				key = group.random(GT)
-				aes_key = generate_key_from_element(group, key)
-				nonce, ciphertext, tag = aes_encrypt(content.encode(), aes_key)
+				backend = backend_for_level(level)
+				key = backend['group'].random(GT)
+				aes_key = generate_key_from_element(backend['group'], key, KEY_MATERIAL_SIZE)
 				encrypted_data[ds_id][level] = {
-					'data': base64.b64encode(nonce + ciphertext + tag).decode(),
-					'key': cpabe.encrypt(pk, key, ds_content['policy'][level])
+					'data': base64.b64encode(aead_encrypt(content.encode(), aes_key, mode)).decode(),
+					'key': backend['cpabe'].encrypt(backend['pk'], key, ds_content['policy'][level]),
+					'backend': backend['name'],
+					'policy': ds_content['policy'][level]
 				}
 	return encrypted_data
 
-def initialize_encrypted_data_rsa(public_key):
+def initialize_encrypted_data_rsa(public_key, mode=DEFAULT_AEAD_MODE):
 	encrypted_data = {}
 	for ds_id, ds_content in data_sets.items():
 		encrypted_data[ds_id] = {}
 		for level, content in ds_content.items():
 			if level != 'policy':
-				aes_key = get_random_bytes(16)
-				nonce, ciphertext, tag = aes_encrypt(content.encode(), aes_key)
+				aes_key = get_random_bytes(KEY_MATERIAL_SIZE)
 				encrypted_aes_key = rsa_encrypt(aes_key, public_key)
 				encrypted_data[ds_id][level] = {
-					'data': base64.b64encode(nonce + ciphertext + tag).decode(),
+					'data': base64.b64encode(aead_encrypt(content.encode(), aes_key, mode)).decode(),
 					'key': base64.b64encode(encrypted_aes_key).decode()
 				}
 	return encrypted_data
 
+# Shared-memory publication of the encrypted stores for multi-process workers. Payloads and wrapped
+# keys are stored as raw bytes; ABE key ciphertexts are serialized with their backend's group.
+def record_bytes(value):
+	return base64.b64decode(value) if isinstance(value, str) else value
+
+ABE_STORE_ENCODERS = {
+	'data': lambda value, record: base64.b64decode(value),
+	'key': lambda value, record: objectToBytes(value, get_backend(*record['backend'])['group']),
+}
+ABE_STORE_DECODERS = {
+	'key': lambda view, record: bytesToObject(bytes(view), get_backend(*record['backend'])['group']),
+}
+RSA_STORE_ENCODERS = {
+	'data': lambda value, record: base64.b64decode(value),
+	'key': lambda value, record: base64.b64decode(value),
+}
+
+def publish_shared_stores():
+	"""Copy both stores into shared memory once; workers call attach_shared_stores with the returned names."""
+	abe_store = SharedRecordStore.build(encrypted_data_abe, ABE_STORE_ENCODERS)
+	rsa_store = SharedRecordStore.build(encrypted_data_rsa, RSA_STORE_ENCODERS)
+	return abe_store, rsa_store
+
+def attach_shared_stores(abe_name, rsa_name):
+	global encrypted_data_abe, encrypted_data_rsa
+	encrypted_data_abe = SharedRecordStore.attach(abe_name, ABE_STORE_DECODERS)
+	encrypted_data_rsa = SharedRecordStore.attach(rsa_name)
+
+def install_token_keys(keys, current=None):
+	"""Share the issuing process's token keys (token_signer.keys, token_signer.current) with a worker."""
+	global token_signer
+	token_signer = TokenSigner(keys, current)
+
+@traced('abe')
 def request_data_abe(token, data_id, sensitivity_level):
-	step_times = {'token_validation': 0, 'key_decryption': 0, 'data_decryption': 0}
+	step_times = {'token_validation': 0, 'policy_check': 0, 'key_decryption': 0, 'data_decryption': 0}
 	total_start_time = time.time()
 	step_start_time = time.time()
 
 	# Token validation
-	if token not in tokens or tokens[token]['expires'] < time.time() or tokens[token]['data_id'] != data_id:
+	token_data = validate_token(token)
+	if token_data is None or not token_covers(token_data, data_id):
 		return "Invalid or expired token.", step_times, time.time() - total_start_time
 	step_times['token_validation'] = time.time() - step_start_time
 
-	user = users.get(tokens[token]['user_id'])
-	if user is None or 'sk' not in user:
-		return "User not found or secret key missing.", step_times, time.time() - total_start_time
+	user = users.get(token_data['user_id'])
 	key_info = encrypted_data_abe.get(data_id, {}).get(sensitivity_level)
 	if key_info is None:
 		return f"No data available for {sensitivity_level} sensitivity level in {data_id}.", step_times, time.time() - total_start_time
+	backend = get_backend(*key_info['backend'])
+	if user is None or backend['name'] not in user.get('sks', {}):
+		return "User not found or secret key missing.", step_times, time.time() - total_start_time
+
+	# Policy pre-check
+	step_start_time = time.time()
+	allowed = policy_allows(token_data['user_id'], user.get('attributes', []), key_info['policy'])
+	step_times['policy_check'] = time.time() - step_start_time
+	if allowed is False:
+		record_rejection(time.time() - total_start_time)
+		return f"Access denied: Insufficient attributes for {sensitivity_level} sensitivity.", step_times, time.time() - total_start_time
 
 	# Key decryption
 	step_start_time = time.time()
-	decrypted_key_element = cpabe.decrypt(pk, user['sk'], key_info['key'])
+	decrypted_key_element = backend['cpabe'].decrypt(backend['pk'], user['sks'][backend['name']], key_info['key'])
 	if not decrypted_key_element:
 		return f"Access denied: Insufficient attributes for {sensitivity_level} sensitivity.", step_times, time.time() - total_start_time
-	decrypted_key = generate_key_from_element(group, decrypted_key_element)
+	decrypted_key = generate_key_from_element(backend['group'], decrypted_key_element, KEY_MATERIAL_SIZE)
 	step_times['key_decryption'] = time.time() - step_start_time
 
 	# Data decryption
 	step_start_time = time.time()
-	raw_data = base64.b64decode(key_info['data'])
-	nonce, ciphertext, tag = raw_data[:16], raw_data[16:-16], raw_data[-16:]
-	decrypted_data = aes_decrypt(nonce, ciphertext, tag, decrypted_key)
+	raw_data = record_bytes(key_info['data'])
+	decrypted_data = aead_decrypt(raw_data, decrypted_key)
 	step_times['data_decryption'] = time.time() - step_start_time
 
 	total_end_time = time.time()
 	return f"Access granted: {user['name']} accessed {sensitivity_level} data in {data_id}: {decrypted_data.decode()}", step_times, total_end_time - total_start_time
 
+def request_data_abe_batch(token, items, max_workers=4):
+	# Serve many (data_id, level) items for one token: the token and user are checked once,
+	# each distinct ABE key is unwrapped once and a failed unwrap denies the rest of its policy
+	# group without further pairing work. AEAD payloads are decrypted in parallel and results
+	# are yielded as (data_id, level, result) as soon as they are ready.
+	batch_start_time = time.time()
+	token_data = validate_token(token)
+	if token_data is None:
+		for data_id, level in items:
+			yield data_id, level, "Invalid or expired token."
+		return
+	user = users.get(token_data['user_id'])
+
+	policy_groups = {}
+	for data_id, level in dict.fromkeys(items):
+		if not token_covers(token_data, data_id):
+			yield data_id, level, "Invalid or expired token."
+			continue
+		key_info = encrypted_data_abe.get(data_id, {}).get(level)
+		if key_info is None:
+			yield data_id, level, f"No data available for {level} sensitivity level in {data_id}."
+			continue
+		policy_groups.setdefault((key_info['backend'], key_info['policy']), []).append((data_id, level, key_info))
+
+	def decrypt_payload(data_id, level, key_info, decrypted_key):
+		with tracer.span('abe_batch.data_decryption'):
+			raw_data = record_bytes(key_info['data'])
+			decrypted_data = aead_decrypt(raw_data, decrypted_key)
+		tracer.increment('abe_batch.grants')
+		return data_id, level, f"Access granted: {user['name']} accessed {level} data in {data_id}: {decrypted_data.decode()}"
+
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		pending = set()
+		for (backend_name, policy), group_items in policy_groups.items():
+			backend = get_backend(*backend_name)
+			if user is None or backend_name not in user.get('sks', {}):
+				for data_id, level, _ in group_items:
+					yield data_id, level, "User not found or secret key missing."
+				continue
+			if policy_allows(token_data['user_id'], user.get('attributes', []), policy) is False:
+				tracer.increment('abe_batch.denials', len(group_items))
+				for data_id, level, _ in group_items:
+					# Latency from the start of the batch to this item's rejection
+					record_rejection(time.time() - batch_start_time)
+					yield data_id, level, f"Access denied: Insufficient attributes for {level} sensitivity."
+				continue
+			for i, (data_id, level, key_info) in enumerate(group_items):
+				with tracer.span('abe_batch.key_decryption'):
+					decrypted_key_element = backend['cpabe'].decrypt(backend['pk'], user['sks'][backend_name], key_info['key'])
+				if not decrypted_key_element:
+					tracer.increment('abe_batch.denials', len(group_items) - i)
+					# Same policy, same attributes: the remaining items of this group are denied too
+					for denied_id, denied_level, _ in group_items[i:]:
+						yield denied_id, denied_level, f"Access denied: Insufficient attributes for {denied_level} sensitivity."
+					break
+				decrypted_key = generate_key_from_element(backend['group'], decrypted_key_element, KEY_MATERIAL_SIZE)
+				pending.add(executor.submit(decrypt_payload, data_id, level, key_info, decrypted_key))
+				for future in [f for f in pending if f.done()]:
+					pending.discard(future)
+					yield future.result()
+		for future in as_completed(pending):
+			yield future.result()
+
+@traced('rsa')
 def request_data_rsa(token, data_id, sensitivity_level, private_key):
 	step_times = {'token_validation': 0, 'key_encryption_transfer': 0, 'key_decryption': 0, 'data_decryption': 0}
 	total_start_time = time.time()
 	step_start_time = time.time()
 
 	# Token validation
-	if token not in tokens or tokens[token]['expires'] < time.time() or tokens[token]['data_id'] != data_id:
+	token_data = validate_token(token)
+	if token_data is None or not token_covers(token_data, data_id):
 		return "Invalid or expired token.", step_times, time.time() - total_start_time
 	step_times['token_validation'] = time.time() - step_start_time
 
-	user = users.get(tokens[token]['user_id'])
+	user = users.get(token_data['user_id'])
 	if user is None:
 		return "User not found.", step_times, time.time() - total_start_time
 	key_info = encrypted_data_rsa.get(data_id, {}).get(sensitivity_level)
@@ -144,7 +320,7 @@ def request_data_rsa(token, data_id, sensitivity_level, private_key):
 
 	# Key encryption and transfer
 	step_start_time = time.time()
-	encrypted_aes_key = base64.b64decode(key_info['key'])
+	encrypted_aes_key = record_bytes(key_info['key'])
 	step_times['key_encryption_transfer'] = time.time() - step_start_time
 
 	# Key decryption
@@ -154,22 +330,38 @@ def request_data_rsa(token, data_id, sensitivity_level, private_key):
 
 	# Data decryption
 	step_start_time = time.time()
-	raw_data = base64.b64decode(key_info['data'])
-	nonce, ciphertext, tag = raw_data[:16], raw_data[16:-16], raw_data[-16:]
-	decrypted_data = aes_decrypt(nonce, ciphertext, tag, aes_key)
+	raw_data = record_bytes(key_info['data'])
+	decrypted_data = aead_decrypt(raw_data, aes_key)
 	step_times['data_decryption'] = time.time() - step_start_time
 
 	total_end_time = time.time()
 	return f"Access granted: {user['name']} accessed {sensitivity_level} data in {data_id}: {decrypted_data.decode()}", step_times, total_end_time - total_start_time
 
-def simulate_user_progression(user_id, data_id, private_key):
+# Sensitivity / reputation levels as ABETokenAccessControl stores them
+LEDGER_LEVELS = {'low': 1, 'medium': 2, 'high': 3}
+
+def record_access_on_ledger(ledger, user_id, data_id, level):
+	# ABETokenAccessControl cannot change a registered user's level, so each progression step registers
+	# under its own address; registration, token grant and the access decision are all charged
+	admin = address_for('admin')
+	user_address = address_for(f"{user_id}:{level}")
+	ledger_data_id = list(data_sets).index(data_id) * len(LEDGER_LEVELS) + LEDGER_LEVELS[level]
+	if ledger_data_id not in ledger.dataItems:
+		ledger.addData(admin, ledger_data_id, LEDGER_LEVELS[level], data_id)
+	ledger.registerUser(admin, user_address, LEDGER_LEVELS[level])
+	ledger.grantToken(admin, user_address)
+	return ledger.requestDataAccess(user_address, ledger_data_id)
+
+def simulate_user_progression(user_id, data_id, private_key, ledger=None):
 	total_response_time_abe = {'low': [], 'medium': [], 'high': []}
 	total_response_time_rsa = {'low': [], 'medium': [], 'high': []}
 
 	for level in ['low', 'medium', 'high']:
 		users[user_id]['reputation'] = REPUTATION_REQUIREMENTS[level]
 		users[user_id]['attributes'] = update_attributes_based_on_reputation(users[user_id]['reputation'])
-		users[user_id]['sk'] = cpabe.keygen(pk, mk, users[user_id]['attributes'])
+		issue_user_keys(users[user_id])
+		if ledger is not None:
+			record_access_on_ledger(ledger, user_id, data_id, level)
 
 		token = generate_token(user_id, data_id)
 		result_abe, step_times_abe, total_time_abe = request_data_abe(token, data_id, level)
@@ -181,6 +373,10 @@ def simulate_user_progression(user_id, data_id, private_key):
 		total_response_time_rsa[level].append((result_rsa, step_times_rsa, total_time_rsa))
 		print(f"RSA - Result: {result_rsa}, Total Time for {level} level: {total_time_rsa:.4f}s, Step Times: {step_times_rsa}")
 
+	if rejection_latency.count:
+		rejections = rejection_latency.summary()
+		print(f"Policy pre-check rejections: {rejections['count']}, Mean Rejection Latency: {rejections['mean_ms']:.4f}ms, p99: {rejections['p99_ms']:.4f}ms")
+
 	# Plotting results
 	levels = ['Low', 'Medium', 'High']
 	abe_times = [sum([time_info[2] for time_info in total_response_time_abe[level]]) / len(total_response_time_abe[level]) for level in ['low', 'medium', 'high']]
@@ -208,5 +404,8 @@ if __name__ == "__main__":
 	initialize_user_keys_abe()
 	private_key, public_key = generate_rsa_keys()
 	encrypted_data_rsa = initialize_encrypted_data_rsa(public_key)
-	simulate_user_progression(user_id, data_id, private_key)
+	chain = Chain()
+	simulate_user_progression(user_id, data_id, private_key, ledger=ABETokenAccessControlSim(chain))
+	chain.print_report()
+	tracer.export_json('access_trace.json')
 
@@ -0,0 +1,100 @@
+import time
+import numpy as np
+
+from config import REPUTATION_REQUIREMENTS, update_attributes_based_on_reputation
+from MRM import classify_levels, reputation_step
+
+# Maps batches of reputation updates to sensitivity levels and attribute sets in bulk and emits
+# only the users whose attribute set changed, so downstream key issuance touches just those users.
+# Attributes are taken to depend only on the level a reputation falls into, so
+# update_attributes_based_on_reputation is called once per level rather than once per user.
+
+class ReputationAttributeMapper:
+    def __init__(self, requirements=REPUTATION_REQUIREMENTS, attribute_fn=update_attributes_based_on_reputation, scale=1.0):
+        self.levels = sorted(requirements, key=requirements.get)
+        self.thresholds = np.array([requirements[level] for level in self.levels], dtype=float)
+        self.attribute_fn = attribute_fn
+        self.scale = scale  # multiplies incoming reputations, e.g. to map MRM's 0-10 scale onto the requirements
+        self.bucket_attributes = {}  # bucket -> frozenset of attributes, bucket -1 is below every level
+        self.attribute_set_ids = {}  # frozenset -> small int, so equal sets in different buckets compare equal
+        self.user_rows = {}
+        self.user_ids = []
+        self.current_sets = np.empty(0, dtype=np.int64)
+        self.last_batch = (None, None)  # (tuple of user_ids, rows) of the previous batch, reused when the ids repeat
+
+    def level_buckets(self, reputations):
+        """Index into self.levels of the highest level each reputation meets, -1 if none."""
+        return np.searchsorted(self.thresholds, reputations, side='right') - 1
+
+    def attribute_set_id(self, bucket, representative):
+        if bucket not in self.bucket_attributes:
+            reputation = self.thresholds[bucket] if bucket >= 0 else representative
+            self.bucket_attributes[bucket] = frozenset(self.attribute_fn(reputation))
+        attributes = self.bucket_attributes[bucket]
+        return self.attribute_set_ids.setdefault(attributes, len(self.attribute_set_ids))
+
+    def rows_for(self, user_ids):
+        # Compare by value against an immutable copy: a list mutated in place must not reuse stale rows
+        key = tuple(user_ids)
+        if key == self.last_batch[0]:
+            return self.last_batch[1]
+        new_users = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in self.user_rows]
+        for user_id in new_users:
+            self.user_rows[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+        if new_users:
+            self.current_sets = np.concatenate([self.current_sets, np.full(len(new_users), -1, dtype=np.int64)])
+        rows = np.fromiter((self.user_rows[user_id] for user_id in user_ids), dtype=np.int64, count=len(user_ids))
+        self.last_batch = (key, rows)
+        return rows
+
+    def apply(self, user_ids, reputations):
+        """Map a batch of (user_id, reputation) updates; return [(user_id, level, attributes)] for changed users only."""
+        reputations = np.asarray(reputations, dtype=float) * self.scale
+        buckets = self.level_buckets(reputations)
+        unique_buckets, first_seen, inverse = np.unique(buckets, return_index=True, return_inverse=True)
+        set_ids = np.array([self.attribute_set_id(int(b), reputations[i]) for b, i in zip(unique_buckets, first_seen)],
+                           dtype=np.int64)[inverse]
+
+        rows = self.rows_for(user_ids)
+        # With repeated users in one batch the last update wins
+        rows, last = np.unique(rows[::-1], return_index=True)
+        last = len(buckets) - 1 - last
+        changed = self.current_sets[rows] != set_ids[last]
+        self.current_sets[rows[changed]] = set_ids[last[changed]]
+
+        return [(self.user_ids[row], self.levels[buckets[i]] if buckets[i] >= 0 else None,
+                 self.bucket_attributes[int(buckets[i])])
+                for row, i in zip(rows[changed], last[changed])]
+
+def apply_to_users(users, changes):
+    """Write a diff from ReputationAttributeMapper.apply into the users dict; returns the user ids to re-key."""
+    for user_id, level, attributes in changes:
+        users[user_id]['attributes'] = list(attributes)
+    return [user_id for user_id, _, _ in changes]
+
+def mrm_updates(init_RPs, transaction_count, score_range=(4, 8), seed=None):
+    """Run the MRM recurrence for many users at once, yielding one batch of reputations per transaction."""
+    rng = np.random.default_rng(seed)
+    RP = np.asarray(init_RPs, dtype=float)
+    codes = classify_levels(RP)
+    for transaction in range(1, transaction_count + 1):
+        DQ, OT, DS, DI = rng.integers(score_range[0], score_range[1], size=(4, len(RP)))
+        RP, codes = reputation_step(RP, codes, transaction, DQ, OT, DS, DI)
+        yield transaction, RP
+
+if __name__ == "__main__":
+    num_users = 100000
+    transaction_count = 200
+    user_ids = [f"user{i}" for i in range(num_users)]
+    mapper = ReputationAttributeMapper()
+    init_RPs = np.random.default_rng(0).uniform(0, 10, num_users)
+
+    start_time = time.perf_counter()
+    total_changes = 0
+    for transaction, RP in mrm_updates(init_RPs, transaction_count, seed=1):
+        total_changes += len(mapper.apply(user_ids, RP))
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Reputation updates mapped: {num_users * transaction_count}, attribute changes emitted: {total_changes}")
+    print(f"Time: {elapsed:.2f}s, {num_users * transaction_count / elapsed:.0f} updates/s")
@@ -0,0 +1,156 @@
+import sys
+import time
+import multiprocessing as mp
+import numpy as np
+
+from NodePool import (initialize_pool, eligible_indices, smallest_k, cast_votes, apply_task, execute_task,
+                      NUM_CANDIDATES, COMMITTEE_SIZE)
+
+# select_pool / update_pool over a population split into contiguous shards, one worker process per shard.
+# Per task every shard first applies the previous task's update (only the committee members it owns, plus
+# the speed recovery every node gets), then returns its local top num_candidates by (load/speed, index).
+# The global top num_candidates is always contained in the union of the local ones, so the coordinator's
+# merge, accuracy ranking and voting reproduce the single-process path exactly.
+
+CANDIDATE_FIELDS = ('ratio', 'index', 'accuracy', 'behavior', 'time', 'speed')
+
+def local_candidates(shard, offset, num_candidates):
+    indices = eligible_indices(shard)
+    ratios = shard['load'][indices] / shard['speed'][indices]
+    local = smallest_k(ratios, indices, num_candidates)
+    return {
+        'ratio': shard['load'][local] / shard['speed'][local],
+        'index': local + offset,
+        'accuracy': shard['accuracy'][local],
+        'behavior': shard['behavior'][local],
+        'time': shard['time'][local],
+        'speed': shard['speed'][local],
+    }
+
+def apply_update(shard, update):
+    if update is not None:
+        indices, votes, majority, duration = update
+        apply_task(shard, indices, votes, majority, duration)
+
+def shard_worker(conn, shard, offset):
+    while True:
+        command, *args = conn.recv()
+        if command == 'step':
+            update, num_candidates = args
+            apply_update(shard, update)
+            conn.send(local_candidates(shard, offset, num_candidates))
+        elif command == 'update':
+            apply_update(shard, args[0])
+            conn.send(None)
+        elif command == 'gather':
+            conn.send(shard)
+        else:
+            break
+    conn.close()
+
+class ShardedPool:
+    def __init__(self, pool, num_workers):
+        size = len(pool['load'])
+        self.bounds = np.linspace(0, size, num_workers + 1).astype(np.int64)
+        self.pending = [None] * num_workers
+        self.connections = []
+        self.workers = []
+        ctx = mp.get_context('spawn')
+        for lo, hi in zip(self.bounds[:-1], self.bounds[1:]):
+            parent, child = ctx.Pipe()
+            shard = {field: values[lo:hi].copy() for field, values in pool.items()}
+            worker = ctx.Process(target=shard_worker, args=(child, shard, int(lo)), daemon=True)
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+    def execute_task(self, duration, rng, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+        """Same contract as NodePool.execute_task; returns (decision, task time)."""
+        for conn, update in zip(self.connections, self.pending):
+            conn.send(('step', update, num_candidates))
+        replies = [conn.recv() for conn in self.connections]
+        candidates = {field: np.concatenate([reply[field] for reply in replies]) for field in CANDIDATE_FIELDS}
+        # in index order, positions break ties the way global indices do
+        by_index = np.argsort(candidates['index'])
+        candidates = {field: values[by_index] for field, values in candidates.items()}
+
+        top = smallest_k(candidates['ratio'], np.arange(len(by_index)), num_candidates)
+        order = np.lexsort((-top, -candidates['accuracy'][top]))
+        committee = top[order[:committee_size]]
+
+        votes = cast_votes(candidates, committee, rng)
+        majority = votes.sum() > len(votes) / 2
+        task_time = (candidates['time'][committee] + duration / candidates['speed'][committee]).max()
+
+        # route each member's delta to the shard that owns it; every shard still hears about the task
+        selected = candidates['index'][committee]
+        owners = np.searchsorted(self.bounds, selected, side='right') - 1
+        for shard in range(len(self.connections)):
+            mine = owners == shard
+            self.pending[shard] = (selected[mine] - self.bounds[shard], votes[mine], majority, duration)
+        return majority, task_time
+
+    def flush(self):
+        for conn, update in zip(self.connections, self.pending):
+            conn.send(('update', update))
+        for conn in self.connections:
+            conn.recv()
+        self.pending = [None] * len(self.connections)
+
+    def gather(self):
+        """The whole population as one pool, with all pending updates applied."""
+        self.flush()
+        for conn in self.connections:
+            conn.send(('gather',))
+        shards = [conn.recv() for conn in self.connections]
+        return {field: np.concatenate([shard[field] for shard in shards]) for field in shards[0]}
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(('stop',))
+            conn.close()
+        for worker in self.workers:
+            worker.join()
+
+def run_single(num_nodes, num_tasks, seed):
+    rng = np.random.default_rng(seed)
+    pool = initialize_pool(num_nodes, rng=rng)
+    durations = rng.choice([5, 10, 15], num_tasks)
+    results = []
+    start_time = time.perf_counter()
+    for duration in durations:
+        results.append(execute_task(pool, duration, rng))
+    return time.perf_counter() - start_time, results, pool
+
+def run_sharded(num_nodes, num_tasks, seed, num_workers):
+    rng = np.random.default_rng(seed)
+    pool = initialize_pool(num_nodes, rng=rng)
+    durations = rng.choice([5, 10, 15], num_tasks)
+    sharded = ShardedPool(pool, num_workers)
+    try:
+        results = []
+        start_time = time.perf_counter()
+        for duration in durations:
+            results.append(sharded.execute_task(duration, rng))
+        elapsed = time.perf_counter() - start_time
+        return elapsed, results, sharded.gather()
+    finally:
+        sharded.close()
+
+def benchmark_scaling(num_nodes=4000000, num_tasks=200, worker_counts=(1, 2, 4, 8), seed=0):
+    """ms/task for the single-process path and 1..N shard workers, checking every run reproduces it."""
+    elapsed, expected, expected_pool = run_single(num_nodes, num_tasks, seed)
+    rows = [{'workers': 0, 'ms_per_task': elapsed / num_tasks * 1000, 'identical': True}]
+    for num_workers in worker_counts:
+        elapsed, results, pool = run_sharded(num_nodes, num_tasks, seed, num_workers)
+        identical = results == expected and all(np.array_equal(pool[field], expected_pool[field]) for field in expected_pool)
+        rows.append({'workers': num_workers, 'ms_per_task': elapsed / num_tasks * 1000, 'identical': identical})
+    return rows
+
+if __name__ == "__main__":
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 4000000
+    print(f"{num_nodes} nodes")
+    print(f"{'workers':>7} {'ms/task':>9} {'identical':>10}")
+    for row in benchmark_scaling(num_nodes):
+        print(f"{row['workers'] or 'single':>7} {row['ms_per_task']:>9.2f} {str(row['identical']):>10}")
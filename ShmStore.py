@@ -0,0 +1,248 @@
+import os
+import pickle
+import struct
+import sys
+import time
+import multiprocessing as mp
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+import numpy as np
+
+# Read-only record store published once in a shared-memory segment, for access workers running in
+# separate processes. Layout of the segment:
+#   record count, key width (8 bytes each) | sorted keys (key width bytes each) | entry offsets
+#   (8 bytes each, count + 1) | payload area
+# Keys are 'data_id\0level' as fixed-width bytes, so a lookup is a binary search over an array view of the
+# segment. Each record's entry is a small pickle in the payload area holding ({field: value},
+# {field: (offset, length)}): binary fields live in the payload area too, everything else (policies, backend
+# names) in the entry. Attaching only maps the segment, and nothing but the looked-up entry is ever copied
+# into a worker; binary fields are read as memoryview slices.
+
+HEADER = struct.Struct('<QQ')
+SEPARATOR = b'\0'
+
+def record_key(data_id, level=''):
+    return str(data_id).encode() + SEPARATOR + str(level).encode()
+
+class LevelRecords(Mapping):
+    """The levels of one data id; a record is only materialized and decoded when its level is looked up."""
+    def __init__(self, store, levels):
+        self.store = store
+        self.levels = levels  # level -> record position
+
+    def __getitem__(self, level):
+        return self.store.record(self.levels[level])
+
+    def __iter__(self):
+        return iter(self.levels)
+
+    def __len__(self):
+        return len(self.levels)
+
+class SharedRecordStore:
+    def __init__(self, shm, decoders=None, owner=False):
+        self.shm = shm
+        self.decoders = decoders or {}
+        self.owner = owner
+        count, width = HEADER.unpack_from(shm.buf, 0)
+        keys_end = HEADER.size + count * width
+        offsets_start = keys_end + (-keys_end % 8)
+        # Views over the segment, not copies
+        self.keys = np.ndarray(count, dtype=f'S{width}', buffer=shm.buf, offset=HEADER.size)
+        self.offsets = np.ndarray(count + 1, dtype=np.int64, buffer=shm.buf, offset=offsets_start)
+        self.payload_start = offsets_start + 8 * (count + 1)
+
+    @classmethod
+    def build(cls, records, encoders=None, name=None):
+        """Publish {data_id: {level: {field: value}}}. encoders[field](value, record) must return bytes;
+        bytes values are stored in the payload area as they are."""
+        encoders = encoders or {}
+        entries, payloads, offset = [], [], 0
+        for data_id, levels in records.items():
+            for level, record in levels.items():
+                values, binary = {}, {}
+                for field, value in record.items():
+                    if field in encoders:
+                        value = encoders[field](value, record)
+                    if isinstance(value, (bytes, bytearray, memoryview)):
+                        payloads.append(value)
+                        binary[field] = (offset, len(value))
+                        offset += len(value)
+                    else:
+                        values[field] = value
+                entries.append((record_key(data_id, level), (data_id, level, values, binary)))
+        entries.sort(key=lambda item: item[0])
+        count = len(entries)
+        width = max([len(key) for key, _ in entries] + [1])
+        entry_offsets = [offset]
+        for _, entry in entries:
+            payloads.append(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+            entry_offsets.append(entry_offsets[-1] + len(payloads[-1]))
+        keys_end = HEADER.size + count * width
+        offsets_start = keys_end + (-keys_end % 8)
+        payload_start = offsets_start + 8 * (count + 1)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=payload_start + entry_offsets[-1])
+        HEADER.pack_into(shm.buf, 0, count, width)
+        keys = np.ndarray(count, dtype=f'S{width}', buffer=shm.buf, offset=HEADER.size)
+        keys[:] = [key for key, _ in entries]
+        offsets = np.ndarray(count + 1, dtype=np.int64, buffer=shm.buf, offset=offsets_start)
+        offsets[:] = entry_offsets
+        del keys, offsets
+        position = payload_start
+        for value in payloads:
+            shm.buf[position:position + len(value)] = value
+            position += len(value)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name, decoders=None):
+        """Map an existing store; decoders[field](view, record) turns a stored field back into its object."""
+        return cls(shared_memory.SharedMemory(name=name), decoders)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def entry(self, position):
+        start = self.payload_start + int(self.offsets[position])
+        end = self.payload_start + int(self.offsets[position + 1])
+        return pickle.loads(self.shm.buf[start:end])
+
+    def record(self, position):
+        _, _, values, binary = self.entry(position)
+        record = dict(values)
+        for field, (offset, length) in binary.items():
+            start = self.payload_start + offset
+            record[field] = self.shm.buf[start:start + length]
+        for field, decode in self.decoders.items():
+            if field in record:
+                record[field] = decode(record[field], record)
+        return record
+
+    def positions(self, data_id):
+        """Record positions of one data id; its keys are contiguous in sort order."""
+        prefix = record_key(data_id)
+        lo = int(np.searchsorted(self.keys, prefix, side='left'))
+        hi = int(np.searchsorted(self.keys, prefix[:-1] + b'\1', side='left'))
+        return range(lo, hi)
+
+    def get(self, data_id, default=None):
+        """Same shape as the plain dict stores: store.get(data_id, {}).get(level)."""
+        prefix = record_key(data_id)
+        levels = {bytes(self.keys[position])[len(prefix):].decode(): position for position in self.positions(data_id)}
+        return LevelRecords(self, levels) if levels else default
+
+    def __getitem__(self, data_id):
+        levels = self.get(data_id)
+        if levels is None:
+            raise KeyError(data_id)
+        return levels
+
+    def __contains__(self, data_id):
+        return len(self.positions(data_id)) > 0
+
+    def __iter__(self):
+        # Original data ids (not their encoded keys), in key order
+        previous = None
+        for position in range(len(self.keys)):
+            data_id = bytes(self.keys[position]).split(SEPARATOR, 1)[0]
+            if data_id != previous:
+                previous = data_id
+                yield self.entry(position)[0]
+
+    def __len__(self):
+        return len({bytes(key).split(SEPARATOR, 1)[0] for key in self.keys})
+
+    def close(self):
+        self.keys = self.offsets = None  # release the views before unmapping
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def memory_usage():
+    """Resident and proportional set size of this process in bytes (PSS is Linux only, peak RSS POSIX only)."""
+    usage = {'rss': None, 'pss': None}
+    try:
+        import resource  # POSIX only; the store itself does not need it
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                if key in ('Rss', 'Pss'):
+                    usage[key.lower()] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return usage
+
+def synthetic_records(num_data_sets, record_size, levels=('low', 'medium', 'high')):
+    return {f'D{i}': {level: {'data': os.urandom(record_size), 'policy': f'{level.upper()}_LEVEL'} for level in levels}
+            for i in range(num_data_sets)}
+
+def touch(store):
+    """Read every byte of every record the way an access worker would."""
+    total = 0
+    for data_id in store:
+        for record in store.get(data_id).values():
+            total += sum(memoryview(record['data'])[::4096])
+    return total
+
+def copy_worker(path, barrier, results):
+    # Baseline: every worker loads its own copy of the store
+    with open(path, 'rb') as f:
+        store = pickle.load(f)
+    touch(store)
+    barrier.wait()
+    results.put(memory_usage())
+    barrier.wait()
+
+def shared_worker(name, barrier, results):
+    store = SharedRecordStore.attach(name)
+    touch(store)
+    barrier.wait()
+    results.put(memory_usage())
+    barrier.wait()
+    store.close()
+
+def measure(target, arg, num_workers):
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(num_workers)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=target, args=(arg, barrier, results)) for _ in range(num_workers)]
+    for w in workers:
+        w.start()
+    usages = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+    return {key: sum(u[key] for u in usages) if all(u[key] is not None for u in usages) else None for key in ('rss', 'pss')}
+
+def benchmark_memory(worker_counts=(1, 2, 4, 8), num_data_sets=1000, record_size=64 << 10, path='store.pkl'):
+    """Total RSS/PSS of all workers, private copies versus one shared store."""
+    records = synthetic_records(num_data_sets, record_size)
+    with open(path, 'wb') as f:
+        pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+    start_time = time.perf_counter()
+    store = SharedRecordStore.build(records)
+    build_time = time.perf_counter() - start_time
+    del records
+    results = []
+    try:
+        for num_workers in worker_counts:
+            results.append({'workers': num_workers, 'copy': measure(copy_worker, path, num_workers),
+                            'shared': measure(shared_worker, store.name, num_workers)})
+    finally:
+        store.close()
+        os.remove(path)
+    return build_time, results
+
+if __name__ == "__main__":
+    worker_counts = tuple(int(a) for a in sys.argv[1:]) or (1, 2, 4, 8)
+    build_time, results = benchmark_memory(worker_counts)
+    print(f"Store built in {build_time:.2f}s")
+    mb = lambda value: f"{value / (1 << 20):.0f}" if value is not None else "n/a"
+    print(f"{'workers':>7} {'copy RSS MB':>12} {'copy PSS MB':>12} {'shared RSS MB':>14} {'shared PSS MB':>14}")
+    for r in results:
+        print(f"{r['workers']:>7} {mb(r['copy']['rss']):>12} {mb(r['copy']['pss']):>12} {mb(r['shared']['rss']):>14} {mb(r['shared']['pss']):>14}")
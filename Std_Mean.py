@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 import os
 import datetime
+from statistics import NormalDist
 
 def initialize_nodes(num_nodes=100, behavior_probs=[0.6, 0.2, 0.2], seed=None):
     if seed is not None:
@@ -55,23 +56,23 @@ def update_speed(nodes, task, selected_indices):
         else:
             node['speed'] = min(15, node['speed'] + 0.1)  # 未被选中的节点速度逐渐恢复
 
-def select_nodes(nodes, dynamic):
+def select_nodes(nodes, dynamic, num_candidates=30, committee_size=7):
     if dynamic:
         selections = sorted(( node['load']/ node['speed'], idx) for idx, node in enumerate(nodes))
-        selected_indices_15 = [idx for _, idx in selections[:30]]
+        selected_indices_15 = [idx for _, idx in selections[:num_candidates]]
         accuracy_scores = [(nodes[idx]['accuracy'], idx) for idx in selected_indices_15]
         accuracy_scores.sort(reverse=True)
-        selected_indices = [idx for _, idx in accuracy_scores[:7]]
+        selected_indices = [idx for _, idx in accuracy_scores[:committee_size]]
     else:
-        selected_indices = np.random.choice(len(nodes), 7, replace=False).tolist()
+        selected_indices = np.random.choice(len(nodes), committee_size, replace=False).tolist()
     return selected_indices
 
 def update_accuracy(nodes, selection_indices, votes, task):
     # Correctly count true votes from the list of boolean votes
     majority_vote = sum(votes) > len(votes) / 2
-    for idx in selection_indices:
+    # Reuse the votes counted for the decision: calling 'vote' again would re-roll random nodes
+    for idx, node_vote in zip(selection_indices, votes):
         node = nodes[idx]
-        node_vote = node['vote'](task, len(node.get('history', [])))  # task is now available
         if (node_vote == majority_vote):
             node['positive_streak'] += 1
             node['negative_streak'] = 0
@@ -84,8 +85,8 @@ def update_accuracy(nodes, selection_indices, votes, task):
             node['accuracy'] = max(node['accuracy'] - decrease, 0)
 
 
-def execute_cumulative_tasks(nodes, task, dynamic=True):
-    selection_indices = select_nodes(nodes, dynamic)
+def execute_cumulative_tasks(nodes, task, dynamic=True, num_candidates=30, committee_size=7):
+    selection_indices = select_nodes(nodes, dynamic, num_candidates, committee_size)
     votes = [nodes[idx]['vote'](task, len(nodes[idx].get('history', []))) for idx in selection_indices]
     for idx in selection_indices:
         nodes[idx]['time'] +=  task['duration']/ nodes[idx]['speed']
@@ -97,32 +98,75 @@ def execute_cumulative_tasks(nodes, task, dynamic=True):
     
     return sum(votes) > len(votes) / 2, total_task_time
 
+class RunningStats:
+    """Welford running mean/variance, so a configuration can stop as soon as its estimate is tight enough."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def ci_width(self, confidence):
+        """Full width of the normal-approximation confidence interval of the mean."""
+        if self.count < 2:
+            return float('inf')
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return 2 * z * np.sqrt(self.m2 / (self.count - 1) / self.count)
+
+def run_once(num_tasks):
+    nodes_dynamic = initialize_nodes()
+    nodes_random = initialize_nodes()
+    total_correct_dynamic = 0
+    total_correct_random = 0
+    total_time_dynamic = 0
+    total_time_random = 0
+    for _ in range(num_tasks):
+        task = generate_task()
+        correct_dynamic, time_dynamic = execute_cumulative_tasks(nodes_dynamic, task, dynamic=True)
+        correct_random, time_random = execute_cumulative_tasks(nodes_random, task, dynamic=False)
+        total_correct_dynamic += correct_dynamic
+        total_correct_random += correct_random
+        total_time_dynamic += time_dynamic
+        total_time_random += time_random
+    time_saving = (total_time_random - total_time_dynamic) / total_time_dynamic * 100
+    accuracy_improvement = (total_correct_dynamic - total_correct_random) / total_correct_random * 100
+    return time_saving, accuracy_improvement
+
 # Main simulation loop
-def run_simulation(num_runs=100, task_sizes=[100, 500, 1000]):
+# With target_ci_width set, each task size runs sequentially until the confidence interval of both
+# estimates is narrower than the target (after at least min_runs runs); num_runs is then the cap.
+def run_simulation(num_runs=100, task_sizes=[100, 500, 1000], target_ci_width=None, min_runs=10, confidence=0.95):
+    results = {}
     for num_tasks in task_sizes:
         print(f"Results for {num_tasks} tasks:")
-        time_savings = []
-        accuracy_improvements = []
-        for _ in range(num_runs):
-            nodes_dynamic = initialize_nodes()
-            nodes_random = initialize_nodes()
-            total_correct_dynamic = 0
-            total_correct_random = 0
-            total_time_dynamic = 0
-            total_time_random = 0
-            for _ in range(num_tasks):
-                task = generate_task()
-                correct_dynamic, time_dynamic = execute_cumulative_tasks(nodes_dynamic, task, dynamic=True)
-                correct_random, time_random = execute_cumulative_tasks(nodes_random, task, dynamic=False)
-                total_correct_dynamic += correct_dynamic
-                total_correct_random += correct_random
-                total_time_dynamic += time_dynamic
-                total_time_random += time_random
-            time_savings.append((total_time_random - total_time_dynamic) / total_time_dynamic * 100)
-            accuracy_improvements.append((total_correct_dynamic - total_correct_random) / total_correct_random * 100)
-        
-        print("Average Time Savings (%): Mean = {:.2f}, Std = {:.2f}".format(np.mean(time_savings), np.std(time_savings)))
-        print("Average Accuracy Improvements (%): Mean = {:.2f}, Std = {:.2f}".format(np.mean(accuracy_improvements), np.std(accuracy_improvements)))
+        time_savings = RunningStats()
+        accuracy_improvements = RunningStats()
+        for run in range(1, num_runs + 1):
+            time_saving, accuracy_improvement = run_once(num_tasks)
+            time_savings.add(time_saving)
+            accuracy_improvements.add(accuracy_improvement)
+            if (target_ci_width is not None and run >= min_runs
+                    and time_savings.ci_width(confidence) <= target_ci_width
+                    and accuracy_improvements.ci_width(confidence) <= target_ci_width):
+                break
+
+        print("Average Time Savings (%): Mean = {:.2f}, Std = {:.2f}".format(time_savings.mean, time_savings.std()))
+        print("Average Accuracy Improvements (%): Mean = {:.2f}, Std = {:.2f}".format(accuracy_improvements.mean, accuracy_improvements.std()))
+        print("Runs used: {} (CI widths: {:.2f}, {:.2f})".format(time_savings.count, time_savings.ci_width(confidence), accuracy_improvements.ci_width(confidence)))
+        results[num_tasks] = {
+            'runs': time_savings.count,
+            'time_savings': (time_savings.mean, time_savings.std()),
+            'accuracy_improvements': (accuracy_improvements.mean, accuracy_improvements.std()),
+        }
+    return results
 
 # Run the simulation for 100 and 1000 tasks
 run_simulation() 
\ No newline at end of file
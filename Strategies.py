@@ -0,0 +1,96 @@
+import copy
+import time
+import numpy as np
+
+from NodePool import (initialize_pool, eligible_indices, smallest_k, select_pool, cast_votes, update_pool,
+                      NUM_CANDIDATES, COMMITTEE_SIZE)
+
+# Committee-selection strategies for the array population and an arena that replays one seeded task
+# stream against each of them. A strategy is called as strategy(pool, rng, mask, num_candidates,
+# committee_size) and returns the indices of the committee_size selected nodes.
+
+def dynamic(pool, rng, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """select_nodes(dynamic=True): lowest load/speed first, then the most accurate of those."""
+    return select_pool(pool, mask, num_candidates, committee_size)
+
+def uniform_random(pool, rng, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """select_nodes(dynamic=False)."""
+    return rng.choice(eligible_indices(pool, mask), committee_size, replace=False)
+
+def power_of_two(pool, rng, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """Each seat goes to the less loaded (load/speed) of two distinct random nodes."""
+    indices = eligible_indices(pool, mask)
+    pairs = rng.choice(indices, min(2 * committee_size, len(indices)), replace=False)
+    first, second = pairs[:committee_size], pairs[committee_size:]
+    second = np.concatenate([second, first[len(second):]])  # nodes without a rival keep their seat
+    first_ratio = pool['load'][first] / pool['speed'][first]
+    second_ratio = pool['load'][second] / pool['speed'][second]
+    return np.where(second_ratio < first_ratio, second, first)
+
+def weighted(pool, rng, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """Sample without replacement with probability proportional to accuracy / (load / speed)."""
+    indices = eligible_indices(pool, mask)
+    weights = pool['accuracy'][indices] * pool['speed'][indices] / pool['load'][indices]
+    if np.count_nonzero(weights) < committee_size:
+        return rng.choice(indices, committee_size, replace=False)
+    return rng.choice(indices, committee_size, replace=False, p=weights / weights.sum())
+
+def least_loaded(pool, rng, mask=None, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """The committee_size lowest load/speed nodes, ignoring accuracy."""
+    indices = eligible_indices(pool, mask)
+    return smallest_k(pool['load'][indices] / pool['speed'][indices], indices, committee_size)
+
+STRATEGIES = {
+    'dynamic': dynamic,
+    'random': uniform_random,
+    'power_of_two': power_of_two,
+    'weighted': weighted,
+    'least_loaded': least_loaded,
+}
+
+def run_strategy(strategy, pool, durations, seed, num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE):
+    """Run one task stream on a private copy of pool; returns completion time, accuracy and selection overhead."""
+    pool = copy.deepcopy(pool)
+    # Separate streams: random strategies draw during selection, which must not shift the votes
+    select_seed, vote_seed = np.random.SeedSequence(seed).spawn(2)
+    select_rng, vote_rng = np.random.default_rng(select_seed), np.random.default_rng(vote_seed)
+    correct = 0
+    total_time = 0.0
+    select_time = 0.0
+    for duration in durations:
+        start_time = time.perf_counter()
+        selected = strategy(pool, select_rng, None, num_candidates, committee_size)
+        select_time += time.perf_counter() - start_time
+        votes = cast_votes(pool, selected, vote_rng)
+        decision, task_time = update_pool(pool, selected, votes, duration)
+        correct += bool(decision)
+        total_time += float(task_time)
+    return {
+        'task_time': total_time,
+        'accuracy': correct / len(durations) * 100,
+        'select_us': select_time / len(durations) * 1e6,
+    }
+
+def run_arena(strategies=STRATEGIES, num_nodes=100, num_tasks=1000, durations=(5, 10, 15), num_runs=10,
+              num_candidates=NUM_CANDIDATES, committee_size=COMMITTEE_SIZE, seed=0):
+    """Every strategy sees the same populations and task streams; metrics are averaged over num_runs."""
+    seeds = np.random.SeedSequence(seed).spawn(num_runs)
+    totals = {name: {'task_time': 0.0, 'accuracy': 0.0, 'select_us': 0.0} for name in strategies}
+    for run_seed in seeds:
+        setup_rng = np.random.default_rng(run_seed)
+        pool = initialize_pool(num_nodes, rng=setup_rng)
+        task_durations = setup_rng.choice(durations, num_tasks)
+        vote_seed = int(setup_rng.integers(2**63))
+        for name, strategy in strategies.items():
+            result = run_strategy(strategy, pool, task_durations, vote_seed, num_candidates, committee_size)
+            for metric, value in result.items():
+                totals[name][metric] += value / num_runs
+    return totals
+
+if __name__ == "__main__":
+    for num_nodes in (100, 10000):
+        print(f"{num_nodes} nodes, 1000 tasks, 10 runs:")
+        print(f"{'strategy':<14} {'task time':>12} {'accuracy %':>11} {'select us':>10}")
+        results = run_arena(num_nodes=num_nodes)
+        for name, r in sorted(results.items(), key=lambda item: item[1]['task_time']):
+            print(f"{name:<14} {r['task_time']:>12.1f} {r['accuracy']:>11.1f} {r['select_us']:>10.1f}")
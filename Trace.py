@@ -0,0 +1,194 @@
+import json
+import threading
+import time
+
+# Low-overhead instrumentation for the access path: named spans feed log-linear (HDR-style) latency
+# histograms and counters. Every thread records into its own histograms, so recording takes no lock;
+# snapshot() merges the per-thread state. A disabled Tracer swaps in no-op methods.
+
+SUB_BUCKET_BITS = 7  # 2^7 sub-buckets per power of two: under 1% relative error
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+def bucket_index(value):
+    """Bucket of a non-negative integer value (nanoseconds)."""
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value >> shift) - SUB_BUCKET_HALF
+
+def bucket_lower_bound(index):
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift, sub_bucket = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+    return (sub_bucket + SUB_BUCKET_HALF) << (shift + 1)
+
+class Histogram:
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value):
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.copy().items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0
+        rank = p / 100 * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_lower_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        ms = 1e-6
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * ms if self.count else 0,
+            'min_ms': (self.min or 0) * ms,
+            'p50_ms': self.percentile(50) * ms,
+            'p90_ms': self.percentile(90) * ms,
+            'p99_ms': self.percentile(99) * ms,
+            'max_ms': self.max * ms,
+        }
+
+class Span:
+    __slots__ = ('state', 'name', 'start')
+
+    def __init__(self, state, name):
+        self.state = state
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start
+        histograms = self.state['histograms']
+        if self.name not in histograms:
+            histograms[self.name] = Histogram()
+        histograms[self.name].record(elapsed)
+        return False
+
+class NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NOOP_SPAN = NoopSpan()
+
+def noop(*args, **kwargs):
+    pass
+
+class Tracer:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.local = threading.local()
+        self.states = []
+        self.register_lock = threading.Lock()  # taken once per thread, never on the recording path
+        if not enabled:
+            self.record = noop
+            self.increment = noop
+            self.span = lambda name: NOOP_SPAN
+
+    def state(self):
+        try:
+            return self.local.state
+        except AttributeError:
+            state = self.local.state = {'histograms': {}, 'counters': {}}
+            with self.register_lock:
+                self.states.append(state)
+            return state
+
+    def span(self, name):
+        """Context manager timing its block into the histogram `name`."""
+        return Span(self.state(), name)
+
+    def record(self, name, seconds):
+        """Record an already measured duration in seconds."""
+        histograms = self.state()['histograms']
+        if name not in histograms:
+            histograms[name] = Histogram()
+        histograms[name].record(int(seconds * 1e9))
+
+    def increment(self, name, amount=1):
+        counters = self.state()['counters']
+        counters[name] = counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Merge every thread's histograms and counters into plain dicts."""
+        histograms = {}
+        counters = {}
+        with self.register_lock:
+            states = list(self.states)
+        for state in states:
+            for name, histogram in state['histograms'].copy().items():
+                histograms.setdefault(name, Histogram()).merge(histogram)
+            for name, count in state['counters'].copy().items():
+                counters[name] = counters.get(name, 0) + count
+        return {'histograms': {name: h.summary() for name, h in sorted(histograms.items())}, 'counters': counters}
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self):
+        with self.register_lock:
+            for state in self.states:
+                state['histograms'] = {}
+                state['counters'] = {}
+
+def benchmark_overhead(iterations=1000000):
+    """ns per operation of a bare loop and of spans/records with tracing enabled and disabled."""
+    results = {}
+    start_time = time.perf_counter_ns()
+    for _ in range(iterations):
+        pass
+    results['bare loop'] = (time.perf_counter_ns() - start_time) / iterations
+    for enabled in (False, True):
+        tracer = Tracer(enabled)
+        label = 'enabled' if enabled else 'disabled'
+        start_time = time.perf_counter_ns()
+        for _ in range(iterations):
+            with tracer.span('bench'):
+                pass
+        results[f'span ({label})'] = (time.perf_counter_ns() - start_time) / iterations
+        start_time = time.perf_counter_ns()
+        for _ in range(iterations):
+            tracer.record('bench', 0.000123)
+        results[f'record ({label})'] = (time.perf_counter_ns() - start_time) / iterations
+        start_time = time.perf_counter_ns()
+        for _ in range(iterations):
+            tracer.increment('bench')
+        results[f'increment ({label})'] = (time.perf_counter_ns() - start_time) / iterations
+    return results
+
+if __name__ == "__main__":
+    for name, ns in benchmark_overhead().items():
+        print(f"{name:<22} {ns:8.1f} ns/op")
@@ -0,0 +1,101 @@
+import numpy as np
+
+from ChainSim import Chain, ERTBRMSim, address_for, REPUTATION_SCALE
+from MRM import classify_levels, reputation_step
+
+# Write-behind buffer in front of ERTBRM.updateReputation. Per-node RP updates are coalesced to the
+# latest value per address and only pushed on chain when the node changes reputation level, when the
+# value moved more than a threshold since the last on-chain write, or when an update has waited longer
+# than the time budget.
+
+class ReputationWriteBehind:
+    def __init__(self, contract, sender, threshold=0.5, max_delay=50, level_of=classify_levels):
+        self.contract = contract
+        self.sender = sender
+        self.threshold = threshold
+        self.max_delay = max_delay
+        self.level_of = level_of
+        self.pending = {}    # address -> (RP, time of the oldest unflushed update)
+        self.flushed = {}    # address -> (RP, level) last written on chain
+        self.updates = 0
+        self.writes = 0
+
+    def record(self, address, RP, now):
+        """Buffer one RP update; writes it through immediately if a flush condition is met."""
+        self.updates += 1
+        first_seen = self.pending[address][1] if address in self.pending else now
+        self.pending[address] = (RP, first_seen)
+        if self.due(address, RP, first_seen, now):
+            self.flush(address)
+
+    def due(self, address, RP, first_seen, now):
+        if address not in self.flushed:
+            return True
+        flushed_RP, flushed_level = self.flushed[address]
+        return (int(self.level_of(RP)) != flushed_level
+                or abs(RP - flushed_RP) >= self.threshold
+                or now - first_seen >= self.max_delay)
+
+    def flush(self, address):
+        RP, _ = self.pending.pop(address)
+        score = int(RP * REPUTATION_SCALE)
+        if address in self.flushed and int(self.flushed[address][0] * REPUTATION_SCALE) == score:
+            self.flushed[address] = (RP, int(self.level_of(RP)))
+            return
+        self.contract.updateReputation(self.sender, address, score)
+        self.flushed[address] = (RP, int(self.level_of(RP)))
+        self.writes += 1
+
+    def flush_due(self, now):
+        """Flush every address whose oldest buffered update is past the time budget."""
+        for address in [a for a, (_, first_seen) in self.pending.items() if now - first_seen >= self.max_delay]:
+            self.flush(address)
+
+    def flush_all(self):
+        for address in list(self.pending):
+            self.flush(address)
+
+    def report(self):
+        return {
+            'updates': self.updates,
+            'naive_calls': self.updates,
+            'calls': self.writes,
+            'calls_saved': self.updates - self.writes,
+            'saved_percentage': (self.updates - self.writes) / self.updates * 100 if self.updates else 0,
+        }
+
+def run_mrm(num_nodes, transaction_count, ledger_writer, on_transaction=None, seed=None):
+    """Drive the MRM recurrence for num_nodes nodes; ledger_writer(address, RP, transaction) receives every step."""
+    rng = np.random.default_rng(seed)
+    addresses = [address_for(f"node{i}") for i in range(num_nodes)]
+    RP = rng.uniform(0, 10, num_nodes)
+    codes = classify_levels(RP)
+    for transaction in range(1, transaction_count + 1):
+        DQ, OT, DS, DI = rng.integers(4, 8, size=(4, num_nodes))
+        RP, codes = reputation_step(RP, codes, transaction, DQ, OT, DS, DI)
+        for address, value in zip(addresses, RP):
+            ledger_writer(address, float(value), transaction)
+        if on_transaction is not None:
+            on_transaction(transaction)
+
+if __name__ == "__main__":
+    num_nodes = 200
+    transaction_count = 500
+    admin = address_for("admin")
+
+    naive_chain = Chain()
+    naive_ledger = ERTBRMSim(naive_chain)
+    run_mrm(num_nodes, transaction_count,
+            lambda address, RP, now: naive_ledger.updateReputation(admin, address, int(RP * REPUTATION_SCALE)), seed=0)
+
+    buffered_chain = Chain()
+    buffer = ReputationWriteBehind(ERTBRMSim(buffered_chain), admin)
+    run_mrm(num_nodes, transaction_count, buffer.record, on_transaction=buffer.flush_due, seed=0)
+    buffer.flush_all()
+
+    naive_gas = sum(call['gas'] for call in naive_chain.calls)
+    buffered_gas = sum(call['gas'] for call in buffered_chain.calls)
+    report = buffer.report()
+    print(f"RP updates: {report['updates']}, naive updateReputation calls: {len(naive_chain.calls)}, "
+          f"write-behind calls: {report['calls']} ({report['saved_percentage']:.1f}% saved)")
+    print(f"Gas: naive {naive_gas}, write-behind {buffered_gas} ({(naive_gas - buffered_gas) / naive_gas * 100:.1f}% saved)")